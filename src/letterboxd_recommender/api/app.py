@@ -1,14 +1,30 @@
 from __future__ import annotations
 
 import os
+import re
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from letterboxd_recommender.api.rate_limit import RateLimitMiddleware
 from letterboxd_recommender.api.routes import router
 from letterboxd_recommender.api.session import create_session_store
+from letterboxd_recommender.api.static import STATIC_DIR, STATIC_MOUNT, VersionedStaticFiles
+from letterboxd_recommender.api.upload_limit import UploadSizeLimitMiddleware
+from letterboxd_recommender.core.dataframe import build_or_load_user_films_df
+from letterboxd_recommender.core.film_metadata import close_shared_client
+from letterboxd_recommender.core.infographic import shutdown_fetch_executor
+from letterboxd_recommender.core.letterboxd_ingest import shutdown_rss_executor
+from letterboxd_recommender.core.recommender import warm_candidate_metadata
+
+# Support both comma-separated values and newline-separated values (common in PaaS).
+_CSV_SPLIT_RE = re.compile(r"[,\n]+")
 
 
 def _parse_csv_env(name: str) -> list[str]:
@@ -16,16 +32,69 @@ def _parse_csv_env(name: str) -> list[str]:
     if not raw:
         return []
 
-    # Support both comma-separated values and newline-separated values (common in PaaS).
-    parts = [p.strip() for p in raw.replace("\n", ",").split(",")]
+    parts = (p.strip() for p in _CSV_SPLIT_RE.split(raw))
     return [p for p in parts if p]
 
 
+def _warm_user_caches(usernames: list[str]) -> None:
+    for username in usernames:
+        try:
+            build_or_load_user_films_df(username)
+        except FileNotFoundError:
+            # Not ingested yet; nothing to warm.
+            continue
+
+
+def _workers_from_env(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    return int(raw) if raw else default
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Optionally pre-load derived data for known users so their first request after a
+    # deploy doesn't pay the build/load cost, e.g.
+    #   LETTERBOXD_RECOMMENDER_WARM_USERS=alice,bob
+    warm_users = _parse_csv_env("LETTERBOXD_RECOMMENDER_WARM_USERS")
+    if warm_users:
+        await run_in_threadpool(_warm_user_caches, warm_users)
+    # Every recommendation scores the popular candidate pool; load its cached
+    # metadata now rather than on the first request.
+    await run_in_threadpool(warm_candidate_metadata)
+    try:
+        yield
+    finally:
+        app.state.recommend_executor.shutdown(wait=False)
+        app.state.io_executor.shutdown(wait=False)
+        close_shared_client()
+        shutdown_fetch_executor()
+        shutdown_rss_executor()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Letterboxd Habit Recommender", version="0.1.0")
+    app = FastAPI(
+        title="Letterboxd Habit Recommender",
+        version="0.1.0",
+        lifespan=_lifespan,
+        # orjson serializes response payloads straight to bytes, much faster than stdlib json.
+        default_response_class=ORJSONResponse,
+    )
 
     # Attach shared components.
     app.state.session_store = create_session_store()
+    # Dedicated pools so scoring and network/disk-bound work (ingest, imports,
+    # metadata fetches) do not queue behind each other or behind Starlette's shared
+    # threadpool.
+    app.state.recommend_executor = ThreadPoolExecutor(
+        max_workers=_workers_from_env(
+            "LETTERBOXD_RECOMMENDER_RECOMMEND_WORKERS", min(32, (os.cpu_count() or 1) + 4)
+        ),
+        thread_name_prefix="recommend",
+    )
+    app.state.io_executor = ThreadPoolExecutor(
+        max_workers=_workers_from_env("LETTERBOXD_RECOMMENDER_IO_WORKERS", 16),
+        thread_name_prefix="io",
+    )
 
     # CORS is intentionally opt-in for production safety.
     # Configure allowed origins via env var, e.g.
@@ -42,7 +111,18 @@ def create_app() -> FastAPI:
             allow_headers=["*"],
         )
 
-    # Basic rate limiting to protect upstream calls.
+    # Compress dynamic JSON responses. Responses that already carry Content-Encoding
+    # pass through untouched: the precompressed index and infographic payloads, and
+    # the streamed report page, which its route gzips with a flush per chunk (this
+    # middleware would hold its early chunks until the page is finished).
+    # Level 6 rather than 9: these are compressed per request.
+    app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
+    # Refuse oversized export uploads before they are spooled to disk.
+    app.add_middleware(UploadSizeLimitMiddleware)
+
+    # Basic rate limiting to protect upstream calls. Added last so it is outermost and
+    # rejects before any other middleware runs.
     app.add_middleware(RateLimitMiddleware)
 
     # Ensure unexpected errors don't leak internals.
@@ -51,6 +131,7 @@ def create_app() -> FastAPI:
         return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
     app.include_router(router)
+    app.mount(STATIC_MOUNT, VersionedStaticFiles(directory=STATIC_DIR), name="static")
     return app
 
 
@@ -2,18 +2,29 @@ from __future__ import annotations
 
 import os
 import time
-from collections import deque
-from dataclasses import dataclass
+from collections.abc import Sequence
 from threading import Lock
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+# Must be a power of two so the shard index is a cheap mask of the key hash.
+_SHARD_COUNT = 64
+_SHARD_MASK = _SHARD_COUNT - 1
 
-@dataclass
-class _Window:
-    hits: deque[float]
+# Each shard drops expired windows after this many checks, so memory stays bounded
+# by recently active clients rather than every IP ever seen.
+_SWEEP_EVERY = 1024
+
+# Ingest endpoints get an additional, stricter bucket (they hit Letterboxd).
+_INGEST_PATH_SUFFIX = "/ingest"
+
+# The reject path should be the cheapest one, so the 429 body and headers are
+# encoded once at import and sent as raw ASGI messages.
+_RATE_LIMITED_BODY = b'{"detail":"Rate limit exceeded"}'
+_RATE_LIMITED_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_RATE_LIMITED_BODY)).encode("latin-1")),
+)
 
 
 class SlidingWindowRateLimiter:
@@ -22,70 +33,173 @@ class SlidingWindowRateLimiter:
     This is not intended to be perfect. It provides basic protection against
     accidental abuse (esp. ingesting / scraping Letterboxd too aggressively).
 
-    Keys are derived from client IP + a logical bucket.
+    Windows are keyed by client IP within a logical bucket (e.g. "global",
+    "ingest"); each bucket has its own dict, so no composite key string is built.
+
+    Each key holds ``[count, window_start, prev_count]`` and the sliding window is
+    approximated as ``count + prev_count * (1 - elapsed / window_s)``. That avoids
+    the 2x burst a plain fixed window allows at its boundary while keeping a check
+    to a dict lookup and some float arithmetic (no per-hit history).
+
+    State is striped across ``_SHARD_COUNT`` locks keyed by the hash of the key, so
+    unrelated clients do not contend on a single lock.
     """
 
     def __init__(self) -> None:
-        self._lock = Lock()
-        self._windows: dict[str, _Window] = {}
-
-    def allow(self, *, key: str, limit: int, window_s: float) -> tuple[bool, int]:
-        now = time.time()
-        cutoff = now - window_s
-        with self._lock:
-            w = self._windows.get(key)
-            if w is None:
-                w = _Window(hits=deque())
-                self._windows[key] = w
+        self._locks = [Lock() for _ in range(_SHARD_COUNT)]
+        # shard -> bucket -> key -> [count, window_start, prev_count]
+        self._windows: list[dict[str, dict[str, list[float]]]] = [{} for _ in range(_SHARD_COUNT)]
+        self._checks = [0] * _SHARD_COUNT
+        # Longest window seen; state older than two of these is dead for every bucket.
+        self._max_window_s = 0.0
+
+    def allow(
+        self, *, key: str, limit: int, window_s: float, bucket: str = "global"
+    ) -> tuple[bool, int]:
+        if limit < 1:
+            return False, 0
+
+        shard = hash(key) & _SHARD_MASK
+        buckets = self._windows[shard]
+        now = time.monotonic()
+        with self._locks[shard]:
+            self._tick_locked(shard, buckets, now, window_s)
+            w, estimate = self._window_locked(buckets, bucket, key, now, window_s)
+            if estimate >= limit:
+                return False, 0
+            w[0] += 1
+
+        return True, max(0, limit - int(estimate + 1))
+
+    def allow_many(
+        self, *, key: str, checks: Sequence[tuple[str, int, float]]
+    ) -> tuple[bool, str | None]:
+        """Check several ``(bucket, limit, window_s)`` limits for one key at once.
+
+        All buckets share the key's shard, so this takes the lock and reads the clock
+        once. Hits are only recorded if every bucket allows the request; otherwise the
+        first rejecting bucket is returned.
+        """
+
+        shard = hash(key) & _SHARD_MASK
+        buckets = self._windows[shard]
+        now = time.monotonic()
+        with self._locks[shard]:
+            self._tick_locked(shard, buckets, now, max(c[2] for c in checks))
+            hits = []
+            for bucket, limit, window_s in checks:
+                w, estimate = self._window_locked(buckets, bucket, key, now, window_s)
+                if estimate >= limit:
+                    return False, bucket
+                hits.append(w)
+            for w in hits:
+                w[0] += 1
+
+        return True, None
+
+    def _tick_locked(
+        self, shard: int, buckets: dict[str, dict[str, list[float]]], now: float, window_s: float
+    ) -> None:
+        if window_s > self._max_window_s:
+            self._max_window_s = window_s
+        self._checks[shard] += 1
+        if self._checks[shard] >= _SWEEP_EVERY:
+            self._checks[shard] = 0
+            self._sweep_locked(buckets, now)
+
+    @staticmethod
+    def _window_locked(
+        buckets: dict[str, dict[str, list[float]]],
+        bucket: str,
+        key: str,
+        now: float,
+        window_s: float,
+    ) -> tuple[list[float], float]:
+        """Return the key's rolled-forward window and its sliding-count estimate."""
+
+        windows = buckets.get(bucket)
+        if windows is None:
+            windows = buckets[bucket] = {}
+        w = windows.get(key)
+        if w is None:
+            w = windows[key] = [0, now, 0]
+        elif now - w[1] >= window_s:
+            # Roll forward; the previous count only carries over from the window
+            # immediately before the current one.
+            elapsed_windows = (now - w[1]) // window_s
+            w[2] = w[0] if elapsed_windows == 1 else 0
+            w[1] += elapsed_windows * window_s
+            w[0] = 0
+
+        return w, w[0] + w[2] * (1.0 - (now - w[1]) / window_s)
+
+    def _sweep_locked(self, buckets: dict[str, dict[str, list[float]]], now: float) -> None:
+        horizon = 2 * self._max_window_s
+        for windows in buckets.values():
+            expired = [k for k, w in windows.items() if now - w[1] >= horizon]
+            for k in expired:
+                del windows[k]
+
+
+def _limits_from_env() -> tuple[int, float, int, float]:
+    """Read (global_limit, global_window_s, ingest_limit, ingest_window_s).
+
+    Defaults can be tuned via env vars (useful for tests/deploy). Read once per
+    middleware instance rather than at import so tests can set env vars before
+    calling ``create_app``.
+    """
 
-            while w.hits and w.hits[0] < cutoff:
-                w.hits.popleft()
+    return (
+        int(os.environ.get("LETTERBOXD_RECOMMENDER_RL_GLOBAL", "60")),
+        float(os.environ.get("LETTERBOXD_RECOMMENDER_RL_GLOBAL_WINDOW_S", "60")),
+        int(os.environ.get("LETTERBOXD_RECOMMENDER_RL_INGEST", "5")),
+        float(os.environ.get("LETTERBOXD_RECOMMENDER_RL_INGEST_WINDOW_S", "60")),
+    )
 
-            if len(w.hits) >= limit:
-                remaining = 0
-                return False, remaining
 
-            w.hits.append(now)
-            remaining = max(0, limit - len(w.hits))
-            return True, remaining
+class RateLimitMiddleware:
+    """Pure ASGI rate-limiting middleware.
 
+    Implemented as a raw ASGI callable rather than ``BaseHTTPMiddleware`` so the
+    pass-through path reads the client IP and path straight from the scope without
+    building a ``Request`` or wrapping the downstream app in a task group.
+    """
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, *, limiter: SlidingWindowRateLimiter | None = None) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, *, limiter: SlidingWindowRateLimiter | None = None) -> None:
+        self.app = app
         self._limiter = limiter or SlidingWindowRateLimiter()
-
-        # Defaults can be tuned via env vars (useful for tests/deploy).
-        self._global_limit = int(os.environ.get("LETTERBOXD_RECOMMENDER_RL_GLOBAL", "60"))
-        self._global_window_s = float(
-            os.environ.get("LETTERBOXD_RECOMMENDER_RL_GLOBAL_WINDOW_S", "60")
-        )
-
-        self._ingest_limit = int(os.environ.get("LETTERBOXD_RECOMMENDER_RL_INGEST", "5"))
-        self._ingest_window_s = float(
-            os.environ.get("LETTERBOXD_RECOMMENDER_RL_INGEST_WINDOW_S", "60")
-        )
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        client_ip = request.client.host if request.client else "unknown"
-
-        ok, _remaining = self._limiter.allow(
-            key=f"{client_ip}:global", limit=self._global_limit, window_s=self._global_window_s
-        )
+        global_limit, global_window_s, ingest_limit, ingest_window_s = _limits_from_env()
+        # Built once so the per-request path only picks one of two tuples.
+        self._global_checks = (("global", global_limit, global_window_s),)
+        self._ingest_checks = self._global_checks + (("ingest", ingest_limit, ingest_window_s),)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        if scope["path"].endswith(_INGEST_PATH_SUFFIX):
+            checks = self._ingest_checks
+        else:
+            checks = self._global_checks
+
+        ok, _bucket = self._limiter.allow_many(key=client_ip, checks=checks)
         if not ok:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded"},
-            )
-
-        if request.url.path.endswith("/ingest"):
-            ok, _remaining = self._limiter.allow(
-                key=f"{client_ip}:ingest", limit=self._ingest_limit, window_s=self._ingest_window_s
-            )
-            if not ok:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded"},
-                )
-
-        return await call_next(request)
+            await _rate_limited(send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+async def _rate_limited(send: Send) -> None:
+    # Fresh header list per response: wrapping middleware may append to it in place.
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": list(_RATE_LIMITED_HEADERS),
+        }
+    )
+    await send({"type": "http.response.body", "body": _RATE_LIMITED_BODY})
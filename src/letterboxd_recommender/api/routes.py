@@ -2,24 +2,46 @@
 
 from __future__ import annotations
 
-import html
-from typing import Annotated
-
-from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import HTMLResponse
-
+import asyncio
+import functools
+import gzip
+import hashlib
+import logging
+import zlib
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
+from typing import Annotated, Any, BinaryIO, TypeVar
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+
+from letterboxd_recommender.api.session import SessionConflictError, SessionStore
+from letterboxd_recommender.api.static import static_url
+from letterboxd_recommender.core.dataframe import (
+    build_or_load_user_films_df,
+    recommendation_cache_epoch,
+    user_data_version,
+)
 from letterboxd_recommender.core.export_import import (
+    ImportedExportData,
     LetterboxdExportImportError,
     import_letterboxd_export,
 )
 from letterboxd_recommender.core.film_metadata import FilmMetadataError
-from letterboxd_recommender.core.infographic import build_infographic_summary
+from letterboxd_recommender.core.infographic import ListKind, cached_infographic_summary
 from letterboxd_recommender.core.letterboxd_ingest import (
+    IngestedLists,
     LetterboxdIngestError,
     LetterboxdUserNotFound,
     ingest_user,
     persist_ingest,
 )
+from letterboxd_recommender.core.recommender import (
+    RecommendationItem,
+    cached_recommend_for_user,
+    top_feature_contributions,
+)
 from letterboxd_recommender.core.schemas import (
     EvaluateRequest,
     EvaluateResponse,
@@ -32,27 +54,84 @@ from letterboxd_recommender.core.schemas import (
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+# Pre-serialized liveness payload. A fresh Response is still built per call:
+# middleware such as CORS mutates response headers in place, so a shared
+# instance would accumulate headers across requests.
+_HEALTH_BODY = b'{"status":"ok"}'
+
 
 @router.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@router.post("/api/users/{username}/ingest", response_model=IngestResponse)
-def ingest(username: str) -> IngestResponse:
-    try:
-        result = ingest_user(username)
-        persist_ingest(result)
+async def _run_in(
+    executor: Executor, func: Callable[..., _T], /, *args: Any, **kwargs: Any
+) -> _T:
+    """Run blocking ``func`` on one of the app's dedicated executors.
+
+    ``app.state.io_executor`` serves network/disk-bound work (ingest, imports,
+    infographic metadata); ``app.state.recommend_executor`` serves scoring. Keeping
+    them apart stops a burst of one kind from queueing behind the other.
+    """
+
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.replace(" ", "").lower()
+            if not q.startswith("q="):
+                return True
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+# The JSON endpoints keep `response_model` for the OpenAPI schema but return
+# ORJSONResponse directly: FastAPI skips the validate-then-serialize round trip for
+# Response instances, and the payloads are built from already-typed core results.
+# orjson serializes dataclasses natively, so core results whose fields mirror the
+# schema (RecommendationItem, FeatureContribution) are passed through as-is.
+
 
-        # Cache derived user features (internal dataframe) with a versioned cache key.
-        from letterboxd_recommender.core.dataframe import build_or_load_user_films_df
+def _ingest_sync(username: str) -> IngestedLists:
+    result = ingest_user(username)
+    persist_ingest(result)
+    return result
 
-        build_or_load_user_films_df(username)
 
-        return IngestResponse(
-            username=username,
-            watched_count=len(result.watched),
-            watchlist_count=len(result.watchlist),
+# Caching the derived user dataframe (versioned by list content) is deferred to a
+# background task after the response is sent: nothing on the request path reads it,
+# and build_or_load_user_films_df rebuilds on a cache miss anyway.
+
+
+@router.post("/api/users/{username}/ingest", response_model=IngestResponse)
+async def ingest(
+    username: str, request: Request, background_tasks: BackgroundTasks
+) -> ORJSONResponse:
+    io_executor = request.app.state.io_executor
+    try:
+        result = await _run_in(io_executor, _ingest_sync, username)
+
+        background_tasks.add_task(_run_in, io_executor, build_or_load_user_films_df, username)
+        return ORJSONResponse(
+            content={
+                "username": username,
+                "watched_count": len(result.watched),
+                "watchlist_count": len(result.watchlist),
+            }
         )
     except LetterboxdUserNotFound as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -60,125 +139,225 @@ def ingest(username: str) -> IngestResponse:
         raise HTTPException(status_code=502, detail=str(e)) from e
 
 
+def _import_export_sync(username: str, filename: str, fileobj: BinaryIO) -> ImportedExportData:
+    imported = import_letterboxd_export(username, filename, fileobj)
+    persist_ingest(imported.lists)
+    return imported
+
+
 @router.post("/api/users/{username}/import-export", response_model=ImportExportResponse)
 async def import_export(
-    username: str, file: Annotated[UploadFile, File(...)]
-) -> ImportExportResponse:
+    username: str,
+    file: Annotated[UploadFile, File(...)],
+    request: Request,
+    background_tasks: BackgroundTasks,
+) -> ORJSONResponse:
     if not file.filename:
         raise HTTPException(status_code=400, detail="Uploaded file is missing a filename")
 
+    io_executor = request.app.state.io_executor
     try:
-        content = await file.read()
-        imported = import_letterboxd_export(username, file.filename, content)
-        persist_ingest(imported.lists)
-
-        from letterboxd_recommender.core.dataframe import build_or_load_user_films_df
+        # Parse straight from the upload's spooled temp file (no full in-memory copy)
+        # and keep the blocking parse/persist work off the event loop.
+        imported = await _run_in(
+            io_executor,
+            _import_export_sync,
+            username,
+            file.filename,
+            file.file,
+        )
 
-        build_or_load_user_films_df(username, force_rebuild=True)
+        background_tasks.add_task(
+            _run_in, io_executor, build_or_load_user_films_df, username, force_rebuild=True
+        )
 
-        return ImportExportResponse(
-            username=username,
-            watched_count=len(imported.lists.watched),
-            watchlist_count=len(imported.lists.watchlist),
-            list_count=imported.list_count,
-            source=imported.source,
+        return ORJSONResponse(
+            content={
+                "username": username,
+                "watched_count": len(imported.lists.watched),
+                "watchlist_count": len(imported.lists.watchlist),
+                "list_count": imported.list_count,
+                "source": imported.source,
+            }
         )
     except LetterboxdExportImportError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
+# Clients may keep the summary but must revalidate; the ETag makes that a cheap 304.
+_INFOGRAPHIC_CACHE_CONTROL = "no-cache"
+# The streamed report commits to a 200 before its body is computed.
+_REPORT_CACHE_CONTROL = "no-store"
+
+
+@functools.lru_cache(maxsize=1024)
+def _encoded_infographic(
+    username: str, list_kind: ListKind, top_n: int, data_version: str, ttl_bucket: int
+) -> tuple[bytes, bytes]:
+    """Serialized infographic JSON and its gzip form, built once per summary cache entry."""
+
+    _, summary = cached_infographic_summary(
+        username,
+        list_kind=list_kind,
+        top_n=top_n,
+        data_version=data_version,
+        ttl_bucket=ttl_bucket,
+    )
+    body = orjson.dumps(
+        {
+            "username": username,
+            "list_kind": summary.list_kind,
+            "film_count": summary.film_count,
+            "top_genres": [{"name": k, "count": v} for k, v in summary.top_genres],
+            "top_decades": [{"name": k, "count": v} for k, v in summary.top_decades],
+            "top_directors": [{"name": k, "count": v} for k, v in summary.top_directors],
+            "runtime_distribution": [{"name": k, "count": v} for k, v in summary.runtime_distribution],
+            "average_runtime_minutes": summary.average_runtime_minutes,
+            "average_user_rating": summary.average_user_rating,
+            "average_global_rating": summary.average_global_rating,
+        }
+    )
+    return body, gzip.compress(body, compresslevel=6, mtime=0)
+
+
 @router.get("/api/users/{username}/infographic", response_model=InfographicSummaryResponse)
-def infographic_summary(
+async def infographic_summary(
+    request: Request,
     username: str,
-    list_kind: str = Query(default="watched", pattern="^(watched|watchlist|all)$"),
+    list_kind: ListKind = "watched",
     top_n: int = Query(default=10, ge=1, le=50),
-) -> InfographicSummaryResponse:
+) -> Response:
+    io_executor = request.app.state.io_executor
     try:
-        summary = build_infographic_summary(username, list_kind=list_kind, top_n=top_n)
-        return InfographicSummaryResponse(
-            username=username,
-            list_kind=summary.list_kind,
-            film_count=summary.film_count,
-            top_genres=[{"name": k, "count": v} for k, v in summary.top_genres],
-            top_decades=[{"name": k, "count": v} for k, v in summary.top_decades],
-            top_directors=[{"name": k, "count": v} for k, v in summary.top_directors],
-            runtime_distribution=[{"name": k, "count": v} for k, v in summary.runtime_distribution],
-            average_runtime_minutes=summary.average_runtime_minutes,
-            average_user_rating=summary.average_user_rating,
-            average_global_rating=summary.average_global_rating,
+        data_version = await _run_in(io_executor, user_data_version, username)
+        # Films whose metadata is unavailable are skipped, so the summary is only
+        # reused (and the ETag only matches) within one cache epoch.
+        ttl_bucket = recommendation_cache_epoch()
+        headers = {
+            "etag": f'W/"{data_version}-{ttl_bucket}"',
+            "cache-control": _INFOGRAPHIC_CACHE_CONTROL,
+            "vary": "Accept-Encoding",
+        }
+        if request.headers.get("if-none-match") == headers["etag"]:
+            return Response(status_code=304, headers=headers)
+
+        body, body_gz = await _run_in(
+            io_executor, _encoded_infographic, username, list_kind, top_n, data_version, ttl_bucket
         )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
-    except FilmMetadataError as e:
-        raise HTTPException(status_code=502, detail=str(e)) from e
 
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["content-encoding"] = "gzip"
+        return Response(content=body_gz, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.post("/api/recommend", response_model=RecommendResponse)
-def recommend(req: RecommendRequest, request: Request) -> RecommendResponse:
-    from letterboxd_recommender.core.recommender import recommend_for_user
 
-    try:
-        store = request.app.state.session_store
-        session_id, state = store.get_or_create(req.session_id)
+_SESSION_SAVE_ATTEMPTS = 3
+
 
-        recs = recommend_for_user(
+def _recommend_with_session(
+    store: SessionStore, req: RecommendRequest
+) -> tuple[str, list[RecommendationItem]]:
+    session_id = req.session_id
+    for attempt in range(_SESSION_SAVE_ATTEMPTS):
+        session_id, state = store.get_or_create(session_id)
+
+        recs = cached_recommend_for_user(
             req.username,
             k=req.k,
             prompt=req.prompt,
-            exclude_slugs=set(state.recommended_slugs),
+            exclude_slugs=state.recommended_slugs,
         )
 
-        # Update per-session exclusion set.
-        state.recommended_slugs |= {r.film_id for r in recs}
-        store.save(session_id, state)
-
-        return RecommendResponse(
-            username=req.username,
-            session_id=session_id,
-            recommendations=[
-                {
-                    "film_id": r.film_id,
-                    "title": r.title,
-                    "year": r.year,
-                    "blurb": r.blurb,
-                    "why": r.why,
-                    "score": r.score,
-                    "score_breakdown": r.score_breakdown,
-                    "overlaps": r.overlaps,
-                }
-                for r in recs
-            ],
+        # Update per-session exclusion set. A concurrent request for the same
+        # session may have saved in the meantime; re-read and recompute so its
+        # exclusions are neither lost nor recommended again.
+        state.recommended_slugs.update(r.film_id for r in recs)
+        try:
+            store.save(session_id, state)
+        except SessionConflictError:
+            if attempt + 1 == _SESSION_SAVE_ATTEMPTS:
+                raise
+            continue
+        break
+    return session_id, recs
+
+
+async def _recommend_or_http_error(
+    req: RecommendRequest, request: Request
+) -> tuple[str, list[RecommendationItem]]:
+    try:
+        # Recommendation work (metadata lookups, scoring, session I/O) runs on the
+        # app's dedicated pool so bursts of it cannot starve the shared threadpool
+        # that serves uploads and the other sync endpoints.
+        return await _run_in(
+            request.app.state.recommend_executor,
+            _recommend_with_session,
+            request.app.state.session_store,
+            req,
         )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
+    except SessionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e)) from e
 
 
-@router.post("/api/evaluate", response_model=EvaluateResponse)
-def evaluate(req: EvaluateRequest) -> EvaluateResponse:
-    from letterboxd_recommender.core.recommender import top_feature_contributions
+@router.post("/api/recommend", response_model=RecommendResponse)
+async def recommend(req: RecommendRequest, request: Request) -> ORJSONResponse:
+    session_id, recs = await _recommend_or_http_error(req, request)
+    return ORJSONResponse(
+        content={
+            "username": req.username,
+            "session_id": session_id,
+            "recommendations": recs,
+        }
+    )
+
 
+async def _iter_ndjson(
+    username: str, session_id: str, recs: list[RecommendationItem]
+) -> AsyncIterator[bytes]:
+    for rec in recs:
+        yield orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    yield orjson.dumps(
+        {"username": username, "session_id": session_id}, option=orjson.OPT_APPEND_NEWLINE
+    )
+
+
+@router.post("/api/recommend/stream")
+async def recommend_stream(req: RecommendRequest, request: Request) -> StreamingResponse:
+    """NDJSON form of /api/recommend for CLI/debug clients.
+
+    One recommendation object per line (same fields as in /api/recommend), then a
+    final ``{"username", "session_id"}`` line.
+    """
+
+    session_id, recs = await _recommend_or_http_error(req, request)
+    return StreamingResponse(
+        _iter_ndjson(req.username, session_id, recs), media_type="application/x-ndjson"
+    )
+
+
+@router.post("/api/evaluate", response_model=EvaluateResponse)
+async def evaluate(req: EvaluateRequest, request: Request) -> ORJSONResponse:
     try:
-        score, top_features = top_feature_contributions(
+        score, top_features = await _run_in(
+            request.app.state.recommend_executor,
+            top_feature_contributions,
             req.username,
             req.film_id,
             top_n=req.top_n,
         )
-        return EvaluateResponse(
-            username=req.username,
-            film_id=req.film_id,
-            score=score,
-            top_features=[
-                {
-                    "feature": f.feature,
-                    "similarity": f.similarity,
-                    "weight": f.weight,
-                    "contribution": f.contribution,
-                    "overlaps": f.overlaps,
-                }
-                for f in top_features
-            ],
+        return ORJSONResponse(
+            content={
+                "username": req.username,
+                "film_id": req.film_id,
+                "score": score,
+                "top_features": top_features,
+            }
         )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -188,358 +367,248 @@ def evaluate(req: EvaluateRequest) -> EvaluateResponse:
         raise HTTPException(status_code=502, detail=str(e)) from e
 
 
-def _fmt_nullable(value: float | None, *, digits: int = 2, suffix: str = "") -> str:
-    if value is None:
-        return "n/a"
-    return f"{value:.{digits}f}{suffix}"
+# Same replacements as html.escape(quote=True), applied in a single pass.
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
 
+def _esc(value: str) -> str:
+    return value.translate(_HTML_ESCAPE_TABLE)
 
-@router.get("/users/{username}/report", response_class=HTMLResponse)
-def user_report(
-    username: str,
-    list_kind: str = Query(default="watched", pattern="^(watched|watchlist|all)$"),
-    top_n: int = Query(default=10, ge=1, le=50),
-    k: int = Query(default=5, ge=1, le=20),
-) -> HTMLResponse:
-    """Human-friendly HTML page showing a user's infographic + recommendations."""
 
-    from letterboxd_recommender.core.recommender import recommend_for_user
+_BAR_ROW = (
+    '<div class="bar-row">'
+    '<div class="bar-label">%s</div>'
+    '<div class="bar-track"><div class="bar-fill" style="width:%d%%"></div></div>'
+    '<div class="bar-val">%d</div>'
+    "</div>"
+)
 
-    try:
-        summary = build_infographic_summary(username, list_kind=list_kind, top_n=top_n)
-        recs = recommend_for_user(username, k=k)
-
-        def _render_rows(items: list[tuple[str, int]]) -> str:
-            if not items:
-                return '<div class="muted"><em>No data.</em></div>'
-
-            max_count = max(c for _, c in items) or 1
-            rows: list[str] = []
-            for name, count in items:
-                width = int((count / max_count) * 100)
-                rows.append(
-                    f"""
-                    <div class="bar-row">
-                      <div class="bar-label">{html.escape(name)}</div>
-                      <div class="bar-track"><div class="bar-fill" style="width:{width}%"></div></div>
-                      <div class="bar-val">{count}</div>
-                    </div>
-                    """
-                )
-            return "\n".join(rows)
-
-        rec_items: list[str] = []
-        for r in recs:
-            year_html = f" <span class=\"year\">({r.year})</span>" if r.year else ""
-            why_html = f"<div class=\"rec-why\">{html.escape(r.why)}</div>" if r.why else ""
-            rec_items.append(
-                "\n".join(
-                    [
-                        '<article class="rec-card">',
-                        f"<h3>{html.escape(r.title)}{year_html}</h3>",
-                        (
-                            f"<div class=\"rec-meta\"><code>{html.escape(r.film_id)}</code>"
-                            f" · score {r.score:.3f}</div>"
-                        ),
-                        f"<p>{html.escape(r.blurb)}</p>",
-                        why_html,
-                        "</article>",
-                    ]
-                )
-            )
 
-        meta_line = (
-            "Infographic list: "
-            f"<code>{html.escape(summary.list_kind)}</code>"
-            f" · films: {summary.film_count}"
-            f" · recs: {len(recs)}"
-        )
+def _render_rows(items: list[tuple[str, int]]) -> str:
+    if not items:
+        return '<div class="muted"><em>No data.</em></div>'
 
-        infographic_url = (
-            f"/api/users/{html.escape(username)}/infographic"
-            f"?list_kind={html.escape(summary.list_kind)}"
-            f"&top_n={top_n}"
-        )
+    # Integer maths, so the top row is always exactly 100%.
+    max_count = max(c for _, c in items) or 1
+    return "\n".join(
+        [_BAR_ROW % (_esc(name), count * 100 // max_count, count) for name, count in items]
+    )
 
-        html_doc = f"""<!doctype html>
+
+_REC_CARD = (
+    '<article class="rec-card">\n<h3>%s%s</h3>\n'
+    '<div class="rec-meta"><code>%s</code> · score %.3f</div>\n<p>%s</p>\n%s\n</article>'
+)
+
+
+def _render_rec_cards(recs: list[RecommendationItem]) -> str:
+    if not recs:
+        return '<div class="muted"><em>No recommendations.</em></div>'
+
+    # Escape each field column in one pass, then fill one template per card.
+    titles = list(map(_esc, [r.title for r in recs]))
+    film_ids = list(map(_esc, [r.film_id for r in recs]))
+    blurbs = list(map(_esc, [r.blurb for r in recs]))
+    whys = [f'<div class="rec-why">{_esc(r.why)}</div>' if r.why else "" for r in recs]
+    years = [f' <span class="year">({r.year})</span>' if r.year else "" for r in recs]
+    scores = [r.score for r in recs]
+    return "".join(
+        [
+            _REC_CARD % fields
+            for fields in zip(titles, years, film_ids, scores, blurbs, whys, strict=True)
+        ]
+    )
+
+
+def _fmt_nullable(value: float | None, template: str = "%.2f") -> str:
+    # Constant %-templates avoid re-parsing a dynamic format spec on every call.
+    return "n/a" if value is None else template % value
+
+
+# Static segments of the report page, encoded once at import. The stylesheet sits
+# before <title> so everything up to the username is a single constant.
+_REPORT_HEAD = f"""<!doctype html>
 <html lang=\"en\">
 <head>
   <meta charset=\"utf-8\" />
   <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <title>Letterboxd report — {html.escape(username)}</title>
-  <style>
-    :root {{
-      --bg: #f5f2ea;
-      --paper: #fffaf0;
-      --ink: #1f1a12;
-      --muted: #6f6253;
-      --line: #dbc8ad;
-      --accent: #a44f2f;
-      --bar: #cf9a66;
-      --bar-soft: #f0dfcc;
-    }}
-    body {{
-      margin: 0;
-      font-family: ui-sans-serif, system-ui, sans-serif;
-      color: var(--ink);
-      background: radial-gradient(circle at top left, #fff3de, #f5f2ea 36rem);
-    }}
-    main {{ max-width: 72rem; margin: 0 auto; padding: 1.2rem; }}
-    header {{ margin-bottom: 1rem; }}
-    h1 {{ margin: 0 0 .25rem 0; }}
-    .muted {{ color: var(--muted); }}
-    .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(18rem, 1fr)); gap: 1rem; }}
-    .card {{ background: var(--paper); border: 1px solid var(--line); border-radius: 1rem; padding: 1rem; }}
-    .stats {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: .6rem; margin-top: .8rem; }}
-    .stat {{ border: 1px solid var(--line); border-radius: .6rem; padding: .55rem .6rem; background: #fff; }}
-    .stat .label {{ font-size: .8rem; color: var(--muted); }}
-    .stat .val {{ font-weight: 700; margin-top: .1rem; }}
-    .bar-row {{ display: grid; grid-template-columns: 8.5rem 1fr 2rem; gap: .5rem; align-items: center; margin: .35rem 0; }}
-    .bar-label {{ font-size: .86rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }}
-    .bar-track {{ height: .58rem; background: var(--bar-soft); border-radius: 999px; overflow: hidden; }}
-    .bar-fill {{ height: 100%; background: var(--bar); }}
-    .bar-val {{ text-align: right; font-size: .82rem; color: var(--muted); }}
-    .recs {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(15rem, 1fr)); gap: .8rem; }}
-    .rec-card {{ background: #fff; border: 1px solid var(--line); border-radius: .8rem; padding: .8rem; margin: 0; }}
-    .rec-card h3 {{ margin: 0; font-size: 1rem; }}
-    .rec-meta {{ font-size: .84rem; color: var(--muted); margin-top: .2rem; }}
-    .rec-card p {{ margin: .55rem 0 .3rem 0; }}
-    .rec-why {{ color: #3a332a; font-size: .92rem; }}
-    code {{ background: #f7ecdd; padding: .08rem .3rem; border-radius: .32rem; }}
-    a {{ color: var(--accent); }}
-  </style>
+  <link rel=\"stylesheet\" href=\"{static_url("report.css")}\" />
+  <title>Letterboxd report — """.encode()
+
+_REPORT_MID = b"""</title>
 </head>
 <body>
   <main>
     <header>
-      <h1>Report: {html.escape(username)}</h1>
-      <div class=\"muted\">{meta_line}</div>
+      <h1>Report: """
+
+# Per-request report chunks (between the <h1> username and </main>), filled with
+# str.format; all values are escaped/formatted by _render_report.
+# First streamed chunk: header meta and infographic summary.
+_REPORT_SUMMARY = """</h1>
+      <div class="muted">{meta_line}</div>
     </header>
 
-    <section class=\"card\" style=\"margin-bottom: 1rem;\">
-      <h2 style=\"margin:0 0 .25rem 0;\">Ratings and Runtime</h2>
-      <div class=\"stats\">
-        <div class=\"stat\"><div class=\"label\">Average runtime</div><div class=\"val\">{_fmt_nullable(summary.average_runtime_minutes, digits=1, suffix='m')}</div></div>
-        <div class=\"stat\"><div class=\"label\">Your average rating</div><div class=\"val\">{_fmt_nullable(summary.average_user_rating)}</div></div>
-        <div class=\"stat\"><div class=\"label\">Global average rating</div><div class=\"val\">{_fmt_nullable(summary.average_global_rating)}</div></div>
+    <section class="card" style="margin-bottom: 1rem;">
+      <h2 style="margin:0 0 .25rem 0;">Ratings and Runtime</h2>
+      <div class="stats">
+        <div class="stat"><div class="label">Average runtime</div><div class="val">{avg_runtime}</div></div>
+        <div class="stat"><div class="label">Your average rating</div><div class="val">{avg_user_rating}</div></div>
+        <div class="stat"><div class="label">Global average rating</div><div class="val">{avg_global_rating}</div></div>
       </div>
-      <div style=\"margin-top:.85rem\">
-        <h3 style=\"margin:.2rem 0\">Runtime distribution</h3>
-        {_render_rows(summary.runtime_distribution)}
+      <div style="margin-top:.85rem">
+        <h3 style="margin:.2rem 0">Runtime distribution</h3>
+        {runtime_rows}
       </div>
     </section>
 
-    <div class=\"grid\">
-      <section class=\"card\">
-        <h2 style=\"margin-top:0\">Top genres</h2>
-        {_render_rows(summary.top_genres)}
+    <div class="grid">
+      <section class="card">
+        <h2 style="margin-top:0">Top genres</h2>
+        {genre_rows}
       </section>
-      <section class=\"card\">
-        <h2 style=\"margin-top:0\">Top decades</h2>
-        {_render_rows(summary.top_decades)}
+      <section class="card">
+        <h2 style="margin-top:0">Top decades</h2>
+        {decade_rows}
       </section>
-      <section class=\"card\">
-        <h2 style=\"margin-top:0\">Top directors</h2>
-        {_render_rows(summary.top_directors)}
+      <section class="card">
+        <h2 style="margin-top:0">Top directors</h2>
+        {director_rows}
       </section>
     </div>
-
-    <section class=\"card\" style=\"margin-top: 1rem;\">
-      <h2 style=\"margin-top:0\">Recommendations</h2>
-      <div class=\"recs\">{''.join(rec_items) or '<div class="muted"><em>No recommendations.</em></div>'}</div>
+"""
+
+# Second streamed chunk: recommendations (computed after the summary is sent).
+_REPORT_RECS = """
+    <section class="card" style="margin-top: 1rem;">
+      <h2 style="margin-top:0">Recommendations</h2>
+      <div class="muted">recs: {rec_count}</div>
+      <div class="recs">{rec_html}</div>
     </section>
 
-    <section class=\"card\" style=\"margin-top: 1rem;\">
-      <h2 style=\"margin-top:0\">API links</h2>
+    <section class="card" style="margin-top: 1rem;">
+      <h2 style="margin-top:0">API links</h2>
       <ul>
-        <li><a href=\"{infographic_url}\">infographic JSON</a></li>
+        <li><a href="{infographic_url}">infographic JSON</a></li>
       </ul>
     </section>
-  </main>
+"""
+
+_REPORT_ERROR = """
+    <section class="card" style="margin-top: 1rem;">
+      <h2 style="margin-top:0">Report unavailable</h2>
+      <p>%s</p>
+    </section>
+"""
+
+_REPORT_TAIL = b"""  </main>
 </body>
 </html>"""
 
-        return HTMLResponse(content=html_doc)
+
+async def _render_report(
+    request: Request, username: str, list_kind: ListKind, top_n: int, k: int
+) -> AsyncIterator[bytes]:
+    escaped_username = _esc(username).encode("utf-8")
+    # The static head (styles) goes out before any computation so the browser can
+    # start parsing while the summary and recommendations are built.
+    yield b"".join([_REPORT_HEAD, escaped_username, _REPORT_MID, escaped_username])
+
+    try:
+        _, summary = await _run_in(
+            request.app.state.io_executor,
+            cached_infographic_summary,
+            username,
+            list_kind=list_kind,
+            top_n=top_n,
+        )
+        meta_line = (
+            "Infographic list: "
+            f"<code>{_esc(summary.list_kind)}</code>"
+            f" · films: {summary.film_count}"
+        )
+        yield _REPORT_SUMMARY.format(
+            meta_line=meta_line,
+            avg_runtime=_fmt_nullable(summary.average_runtime_minutes, "%.1fm"),
+            avg_user_rating=_fmt_nullable(summary.average_user_rating),
+            avg_global_rating=_fmt_nullable(summary.average_global_rating),
+            runtime_rows=_render_rows(summary.runtime_distribution),
+            genre_rows=_render_rows(summary.top_genres),
+            decade_rows=_render_rows(summary.top_decades),
+            director_rows=_render_rows(summary.top_directors),
+        ).encode("utf-8")
+
+        recs = await _run_in(
+            request.app.state.recommend_executor, cached_recommend_for_user, username, k=k
+        )
+        infographic_url = (
+            f"/api/users/{_esc(username)}/infographic"
+            f"?list_kind={_esc(summary.list_kind)}"
+            f"&top_n={top_n}"
+        )
+        yield _REPORT_RECS.format(
+            rec_count=len(recs),
+            rec_html=_render_rec_cards(recs),
+            infographic_url=infographic_url,
+        ).encode("utf-8")
+    except (FileNotFoundError, FilmMetadataError) as e:
+        # The 200 status is already sent; report the failure inside the page.
+        yield (_REPORT_ERROR % _esc(str(e))).encode("utf-8")
+    except Exception:
+        # Anything else is a bug, not an upstream failure: don't dress it up as a
+        # page. Re-raising aborts the response so the client sees it as incomplete.
+        logger.exception("Failed to render report for %s", username)
+        raise
+
+    yield _REPORT_TAIL
+
+
+async def _gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # GZipMiddleware's GzipFile only emits what zlib chooses to, so a small first
+    # chunk would sit in its buffer until the whole report is done. A sync flush per
+    # chunk keeps each piece decodable by the browser as soon as it arrives.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+@router.get("/users/{username}/report", response_class=HTMLResponse)
+async def user_report(
+    request: Request,
+    username: str,
+    list_kind: ListKind = "watched",
+    top_n: int = Query(default=10, ge=1, le=50),
+    k: int = Query(default=5, ge=1, le=20),
+) -> Response:
+    """Human-friendly HTML page showing a user's infographic + recommendations."""
+
+    # Unknown users are resolved before streaming so they still get a 404 status.
+    try:
+        await _run_in(request.app.state.io_executor, user_data_version, username)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
-    except FilmMetadataError as e:
-        raise HTTPException(status_code=502, detail=str(e)) from e
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e)) from e
 
+    # Headers go out before the body is computed, and the body can still end in an
+    # error section, so the page must not be stored or revalidated against an ETag.
+    headers = {"cache-control": _REPORT_CACHE_CONTROL, "vary": "Accept-Encoding"}
+    body = _render_report(request, username, list_kind, top_n, k)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        # Compressed here (GZipMiddleware passes encoded responses through).
+        headers["content-encoding"] = "gzip"
+        body = _gzip_stream(body)
+    return StreamingResponse(body, media_type="text/html; charset=utf-8", headers=headers)
 
-@router.get("/", response_class=HTMLResponse)
-def index() -> HTMLResponse:
-    """Single-page UI for ingestion, infographic, and iterative recommendations."""
 
-    html_doc = """<!doctype html>
+_INDEX_HTML = """<!doctype html>
 <html lang=\"en\">
 <head>
   <meta charset=\"utf-8\" />
   <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
   <title>Letterboxd Recommender</title>
-  <style>
-    :root {
-      --bg: #10171d;
-      --bg-alt: #0b1116;
-      --panel: #17222b;
-      --panel-soft: #1f2f3b;
-      --text: #ecf3f8;
-      --muted: #9eb3c4;
-      --line: #2b3f4e;
-      --accent: #f5a24a;
-      --accent-2: #6ccadf;
-      --chip: #22394a;
-      --bar-bg: #223544;
-      --bar-fill: linear-gradient(90deg, #6ccadf, #f5a24a);
-    }
-    * { box-sizing: border-box; }
-    body {
-      margin: 0;
-      color: var(--text);
-      background:
-        radial-gradient(80rem 40rem at -10% -20%, #294458 0%, rgba(41, 68, 88, 0) 45%),
-        radial-gradient(70rem 35rem at 110% -10%, #583b2c 0%, rgba(88, 59, 44, 0) 38%),
-        linear-gradient(160deg, var(--bg), var(--bg-alt));
-      font-family: ui-sans-serif, system-ui, sans-serif;
-      min-height: 100vh;
-    }
-    .container { max-width: 80rem; margin: 0 auto; padding: 1rem; }
-    header {
-      border: 1px solid var(--line);
-      border-radius: 1rem;
-      padding: 1rem;
-      background: rgba(23, 34, 43, 0.9);
-      backdrop-filter: blur(6px);
-    }
-    h1 { margin: 0; font-size: 1.4rem; }
-    .muted { color: var(--muted); }
-    .layout {
-      display: grid;
-      grid-template-columns: 1.3fr .7fr;
-      gap: 1rem;
-      margin-top: 1rem;
-    }
-    @media (max-width: 980px) { .layout { grid-template-columns: 1fr; } }
-    .card {
-      border: 1px solid var(--line);
-      border-radius: 1rem;
-      background: rgba(23, 34, 43, 0.92);
-      padding: 1rem;
-    }
-    label { display: block; font-size: .88rem; margin-bottom: .25rem; color: var(--muted); }
-    input, button { font: inherit; color: inherit; }
-    input[type=text] {
-      width: 100%;
-      padding: .62rem .72rem;
-      border-radius: .65rem;
-      border: 1px solid var(--line);
-      background: var(--panel-soft);
-    }
-    button {
-      padding: .6rem .9rem;
-      border-radius: .65rem;
-      border: 1px solid #476173;
-      background: linear-gradient(135deg, #375266, #273947);
-      cursor: pointer;
-      transition: transform .14s ease, border-color .14s ease;
-    }
-    button:hover { transform: translateY(-1px); border-color: #6f8ca1; }
-    button:disabled { opacity: .5; cursor: not-allowed; transform: none; }
-    .row { display: grid; grid-template-columns: 1fr auto; gap: .55rem; align-items: end; }
-    .pill {
-      display: inline-block;
-      padding: .16rem .48rem;
-      border-radius: 999px;
-      border: 1px solid var(--line);
-      background: var(--chip);
-      font-size: .8rem;
-    }
-    .chat {
-      margin-top: .8rem;
-      max-height: 22rem;
-      overflow: auto;
-      display: flex;
-      flex-direction: column;
-      gap: .5rem;
-      padding-right: .2rem;
-    }
-    .msg {
-      max-width: 38rem;
-      border: 1px solid var(--line);
-      border-radius: .78rem;
-      padding: .56rem .68rem;
-      white-space: pre-wrap;
-      animation: rise .22s ease;
-    }
-    .msg.user { margin-left: auto; background: #324c61; }
-    .msg.bot { background: #1f303c; }
-    .rec-grid {
-      margin-top: .85rem;
-      display: grid;
-      gap: .65rem;
-      grid-template-columns: repeat(auto-fit, minmax(13rem, 1fr));
-    }
-    .rec {
-      border: 1px solid var(--line);
-      border-radius: .75rem;
-      background: #1e2d37;
-      padding: .6rem;
-    }
-    .rec h4 { margin: 0 0 .2rem 0; font-size: .98rem; }
-    .rec-meta { font-size: .8rem; color: var(--muted); }
-    .rec p { margin: .38rem 0 0 0; font-size: .9rem; }
-    .stats {
-      display: grid;
-      grid-template-columns: 1fr 1fr;
-      gap: .55rem;
-      margin: .8rem 0;
-    }
-    .stat {
-      border: 1px solid var(--line);
-      border-radius: .7rem;
-      padding: .5rem .55rem;
-      background: #1a2832;
-    }
-    .stat .k { color: var(--muted); font-size: .78rem; }
-    .stat .v { font-weight: 700; margin-top: .12rem; }
-    .chart { margin-top: .55rem; }
-    .bar-row {
-      display: grid;
-      grid-template-columns: 7.5rem 1fr 2rem;
-      gap: .45rem;
-      align-items: center;
-      margin: .3rem 0;
-    }
-    .bar-label { font-size: .82rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
-    .bar-track { height: .54rem; background: var(--bar-bg); border-radius: 999px; overflow: hidden; }
-    .bar-fill { height: 100%; background: var(--bar-fill); }
-    .bar-count { font-size: .78rem; color: var(--muted); text-align: right; }
-    hr { border: none; border-top: 1px solid var(--line); margin: .8rem 0; }
-    .help {
-      margin-top: .65rem;
-      padding: .6rem .7rem;
-      border: 1px solid var(--line);
-      border-radius: .7rem;
-      background: #1b2a34;
-      font-size: .86rem;
-    }
-    .help ol { margin: .35rem 0 .1rem 1.1rem; padding: 0; }
-    .help a { color: var(--accent-2); }
-    .inline-upload { margin-top: .6rem; }
-    .inline-upload input[type=file] {
-      width: 100%;
-      padding: .45rem;
-      border: 1px dashed var(--line);
-      border-radius: .6rem;
-      background: #1a2832;
-    }
-    @keyframes rise {
-      from { opacity: 0; transform: translateY(3px); }
-      to { opacity: 1; transform: translateY(0); }
-    }
-    code { background: #283d4d; border-radius: .3rem; padding: .05rem .28rem; }
-  </style>
+  <link rel=\"stylesheet\" href=\"__APP_CSS_URL__\" />
 </head>
 <body>
   <div class=\"container\">
@@ -816,4 +885,33 @@ def index() -> HTMLResponse:
 </body>
 </html>"""
 
-    return HTMLResponse(content=html_doc)
+# The index page has no per-request content; encode it once at import.
+_INDEX_BYTES = _INDEX_HTML.replace("__APP_CSS_URL__", static_url("app.css")).encode("utf-8")
+# Compressed once at import; mtime=0 keeps the bytes (and any ETag) stable.
+_INDEX_GZ = gzip.compress(_INDEX_BYTES, compresslevel=9, mtime=0)
+_INDEX_ETAG = hashlib.blake2b(_INDEX_BYTES, digest_size=8).hexdigest()
+# The page only changes on deploy; the ETag lets browsers revalidate after max-age.
+_INDEX_HEADERS = {
+    "cache-control": "public, max-age=3600",
+    "etag": f'"{_INDEX_ETAG}"',
+    "vary": "Accept-Encoding",
+}
+_INDEX_GZ_HEADERS = {
+    **_INDEX_HEADERS,
+    "content-encoding": "gzip",
+    "etag": f'"{_INDEX_ETAG}-gzip"',
+}
+
+
+@router.get("/", response_class=HTMLResponse)
+async def index(request: Request) -> Response:
+    """Single-page UI for ingestion, infographic, and iterative recommendations."""
+
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        content, headers = _INDEX_GZ, _INDEX_GZ_HEADERS
+    else:
+        content, headers = _INDEX_BYTES, _INDEX_HEADERS
+
+    if request.headers.get("if-none-match") == headers["etag"]:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=content, headers=headers)
@@ -1,18 +1,34 @@
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
 from uuid import uuid4
 
+import orjson
+
+
+class SessionConflictError(RuntimeError):
+    """Raised when a session was saved by another request since it was read."""
+
 
 @dataclass
 class SessionState:
     recommended_slugs: set[str] = field(default_factory=set)
+    # Row version the state was read at; ``save`` only succeeds if it is unchanged.
+    version: int = 0
+
+
+# Eviction scans the whole table, so it runs every N writes rather than on each one.
+_EVICT_EVERY = 256
+
+# Reads only refresh ``updated_at`` (used for eviction order) once it is this stale,
+# so repeat reads of an active session don't each cost a write + commit.
+_TOUCH_INTERVAL_S = 60.0
 
 
 def _default_data_dir() -> Path:
@@ -29,6 +45,15 @@ class SessionStore:
     Stores a single piece of state per session:
       - recommended_slugs: set[str]
 
+    Saves use optimistic concurrency: each row carries a version that ``save``
+    compares-and-increments, so concurrent requests for the same session (e.g. two
+    tabs) cannot silently overwrite each other's exclusions.
+
+    Recently used sessions are also kept in a process-local read cache, so the common
+    read-then-save cycle only touches SQLite for the (durable) save. The cache may go
+    stale if another worker process saves the same session; the version check then
+    fails, the entry is dropped, and the caller's retry reads from SQLite.
+
     The schema is intentionally tiny and uses standard library sqlite3.
     """
 
@@ -49,18 +74,35 @@ class SessionStore:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self._lock = Lock()
+        self._writes = 0
+        # session_id -> (recommended_slugs, version, updated_at), least recent first.
+        self._cache: OrderedDict[str, tuple[frozenset[str], int, float]] = OrderedDict()
         # check_same_thread=False because TestClient may access across threads.
         self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only fsyncs at checkpoints; a crash can lose the last few
+        # commits but never corrupts the database, which is fine for session state.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # Keep the (small) sessions table in memory: ~20 MB page cache, reads via mmap.
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._conn.execute("PRAGMA mmap_size=268435456")
         self._conn.execute(
             """
             CREATE TABLE IF NOT EXISTS sessions (
               session_id TEXT PRIMARY KEY,
               recommended_slugs_json TEXT NOT NULL,
-              updated_at REAL NOT NULL
+              updated_at REAL NOT NULL,
+              version INTEGER NOT NULL DEFAULT 0
             )
             """
         )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            # Databases created before versioning was added.
+            self._conn.execute(
+                "ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
         self._conn.commit()
 
     def close(self) -> None:
@@ -73,48 +115,90 @@ class SessionStore:
                 session_id = uuid4().hex
 
             now = time.time()
-            cur = self._conn.execute(
-                "SELECT recommended_slugs_json FROM sessions WHERE session_id = ?",
-                (session_id,),
-            )
-            row = cur.fetchone()
-            if row is None:
-                state = SessionState()
+            cached = self._cache.get(session_id)
+            if cached is not None:
+                self._cache.move_to_end(session_id)
+                slugs, version, updated_at = cached
+            else:
+                cur = self._conn.execute(
+                    "SELECT recommended_slugs_json, version, updated_at FROM sessions "
+                    "WHERE session_id = ?",
+                    (session_id,),
+                )
+                row = cur.fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sessions("
+                        "session_id, recommended_slugs_json, updated_at) "
+                        "VALUES (?, ?, ?)",
+                        (session_id, "[]", now),
+                    )
+                    self._after_write(now)
+                    self._remember(session_id, frozenset(), 0, now)
+                    return session_id, SessionState()
+
+                try:
+                    slugs = frozenset(orjson.loads(row[0]))
+                except Exception:
+                    slugs = frozenset()
+                version, updated_at = row[1], row[2]
+
+            if now - updated_at >= _TOUCH_INTERVAL_S:
+                # Touch updated_at for LRU-ish eviction.
                 self._conn.execute(
-                    "INSERT OR REPLACE INTO sessions(" 
-                    "session_id, recommended_slugs_json, updated_at) "
-                    "VALUES (?, ?, ?)",
-                    (session_id, json.dumps([]), now),
+                    "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                    (now, session_id),
                 )
                 self._conn.commit()
-                self._evict_if_needed(now)
-                return session_id, state
+                updated_at = now
+            self._remember(session_id, slugs, version, updated_at)
+            return session_id, SessionState(recommended_slugs=set(slugs), version=version)
 
-            try:
-                slugs = set(json.loads(row[0]))
-            except Exception:
-                slugs = set()
-            state = SessionState(recommended_slugs=slugs)
+    def save(self, session_id: str, state: SessionState) -> None:
+        """Persist ``state`` if the session is still at ``state.version``.
 
-            # Touch updated_at for LRU-ish eviction.
-            self._conn.execute(
-                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
-                (now, session_id),
-            )
-            self._conn.commit()
-            return session_id, state
+        Raises:
+            SessionConflictError: if the session was saved (or evicted) since
+            ``state`` was read. Callers should re-read and retry.
+        """
 
-    def save(self, session_id: str, state: SessionState) -> None:
         with self._lock:
             now = time.time()
-            self._conn.execute(
-                "INSERT OR REPLACE INTO sessions(" 
-                "session_id, recommended_slugs_json, updated_at) "
-                "VALUES (?, ?, ?)",
-                (session_id, json.dumps(sorted(state.recommended_slugs)), now),
+            cur = self._conn.execute(
+                "UPDATE sessions SET recommended_slugs_json = ?, updated_at = ?, "
+                "version = version + 1 WHERE session_id = ? AND version = ?",
+                (
+                    # Set order is fine here; sorting cost O(n log n) on every save.
+                    orjson.dumps(list(state.recommended_slugs)).decode(),
+                    now,
+                    session_id,
+                    state.version,
+                ),
             )
-            self._conn.commit()
+            if cur.rowcount == 0:
+                # Our cached copy (if any) is stale; the retry must re-read SQLite.
+                self._cache.pop(session_id, None)
+                raise SessionConflictError(
+                    f"Session '{session_id}' was modified by another request"
+                )
+            self._after_write(now)
+            state.version += 1
+            self._remember(session_id, frozenset(state.recommended_slugs), state.version, now)
+
+    def _remember(
+        self, session_id: str, slugs: frozenset[str], version: int, updated_at: float
+    ) -> None:
+        self._cache[session_id] = (slugs, version, updated_at)
+        self._cache.move_to_end(session_id)
+        if len(self._cache) > self._max_sessions:
+            self._cache.popitem(last=False)
+
+    def _after_write(self, now: float) -> None:
+        # Periodic eviction shares the write's transaction, so each write is one commit.
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
             self._evict_if_needed(now)
+        self._conn.commit()
 
     def _evict_if_needed(self, now: float) -> None:
         # Remove old sessions.
@@ -125,7 +209,6 @@ class SessionStore:
         cur = self._conn.execute("SELECT COUNT(*) FROM sessions")
         (count,) = cur.fetchone() or (0,)
         if count <= self._max_sessions:
-            self._conn.commit()
             return
 
         to_delete = count - self._max_sessions
@@ -135,7 +218,6 @@ class SessionStore:
             ")",
             (to_delete,),
         )
-        self._conn.commit()
 
 
 def create_session_store() -> SessionStore:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# A full Letterboxd export ZIP is typically well under a few MB.
+DEFAULT_MAX_UPLOAD_MB = 50.0
+
+_UPLOAD_PATH_SUFFIX = "/import-export"
+
+_TOO_LARGE_DETAIL = "Upload too large"
+_TOO_LARGE_BODY = b'{"detail":"Upload too large"}'
+_TOO_LARGE_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_TOO_LARGE_BODY)).encode("latin-1")),
+)
+
+
+def max_upload_bytes_from_env() -> int:
+    raw = os.environ.get("LETTERBOXD_RECOMMENDER_MAX_UPLOAD_MB", "").strip()
+    return int(float(raw or DEFAULT_MAX_UPLOAD_MB) * 1024 * 1024)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized export uploads before Starlette spools them.
+
+    This has to sit in front of the route: the multipart body is parsed (and written to
+    a temp file) before the handler runs. Requests declaring a too-large
+    ``Content-Length`` are refused without reading the body; otherwise the received
+    bytes are counted per chunk, so chunked uploads are cut off at the limit too.
+    """
+
+    def __init__(self, app: ASGIApp, *, max_bytes: int | None = None) -> None:
+        self.app = app
+        self.max_bytes = max_upload_bytes_from_env() if max_bytes is None else max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].endswith(_UPLOAD_PATH_SUFFIX):
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.max_bytes
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > max_bytes:
+                    await _too_large(send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Raised inside body parsing, so FastAPI passes it through as a 413.
+                    raise HTTPException(status_code=413, detail=_TOO_LARGE_DETAIL)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def _too_large(send: Send) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": list(_TOO_LARGE_HEADERS),
+        }
+    )
+    await send({"type": "http.response.body", "body": _TOO_LARGE_BODY})
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import hashlib
 import json
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Final
 
+import orjson
 import pandas as pd
 
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists, _default_data_dir
@@ -39,7 +42,7 @@ SPEC_MIN_COLUMNS: Final[set[str]] = {
 }
 
 # Bump this when the user-film dataframe schema or feature engineering changes.
-USER_FILMS_CACHE_VERSION: Final[str] = "v1"
+USER_FILMS_CACHE_VERSION: Final[str] = "v2"
 
 
 @dataclass(frozen=True)
@@ -60,7 +63,12 @@ class UserDerivedDataPaths:
 
 
 def user_data_paths(username: str, *, data_dir: Path | None = None) -> UserDataPaths:
-    base = data_dir or _default_data_dir()
+    return _user_data_paths(data_dir or _default_data_dir(), username)
+
+
+@lru_cache(maxsize=1024)
+def _user_data_paths(base: Path, username: str) -> UserDataPaths:
+    # Called several times per request; the joined Paths are immutable, so reuse them.
     user_dir = base / "users" / username
     return UserDataPaths(
         user_dir=user_dir,
@@ -69,14 +77,41 @@ def user_data_paths(username: str, *, data_dir: Path | None = None) -> UserDataP
     )
 
 
-def _slug_digest(slugs: list[str]) -> str:
-    h = hashlib.sha256()
-    for slug in slugs:
-        h.update(slug.encode("utf-8"))
-        h.update(b"\n")
+def user_data_version(username: str, *, data_dir: Path | None = None) -> str:
+    """Cheap fingerprint of a user's persisted lists, for in-memory cache keys.
+
+    Built from the list files' path, mtime and size (a stat, not a read), so it
+    changes whenever an ingest/import rewrites them.
+    """
+
+    paths = user_data_paths(username, data_dir=data_dir)
+    if not paths.user_dir.exists():
+        raise FileNotFoundError(f"No data found for user '{username}' in {paths.user_dir}")
+
+    h = hashlib.blake2b(digest_size=8)
+    for path in (paths.watched_path, paths.watchlist_path):
+        h.update(str(path).encode("utf-8"))
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            h.update(b"\0missing\0")
+            continue
+        h.update(f"\0{st.st_mtime_ns}\0{st.st_size}\0".encode())
     return h.hexdigest()
 
 
+# In-memory memos keyed by user_data_version (recommendations, infographic
+# summaries) are also bounded in age, so results degraded by transient metadata
+# failures are not served until the next ingest.
+RECOMMEND_CACHE_TTL_S = 600.0
+
+
+def recommendation_cache_epoch() -> int:
+    """Current ``RECOMMEND_CACHE_TTL_S`` window; memoised results change with it."""
+
+    return int(time.monotonic() // RECOMMEND_CACHE_TTL_S)
+
+
 def user_features_cache_key(lists: IngestedLists) -> str:
     """Compute a versioned cache key for derived user features.
 
@@ -87,17 +122,13 @@ def user_features_cache_key(lists: IngestedLists) -> str:
     This keeps cached derived features safe to reuse across runs.
     """
 
-    watched_digest = _slug_digest(lists.watched)
-    watchlist_digest = _slug_digest(lists.watchlist)
-
-    h = hashlib.sha256()
-    h.update(USER_FILMS_CACHE_VERSION.encode("utf-8"))
-    h.update(b"\0")
-    h.update(watched_digest.encode("utf-8"))
-    h.update(b"\0")
-    h.update(watchlist_digest.encode("utf-8"))
-
-    return f"user-films-df-{USER_FILMS_CACHE_VERSION}-{h.hexdigest()[:16]}"
+    # One pass over "version\0watched\0watchlist" (slugs newline-separated; slugs never
+    # contain either separator). Not a security boundary, so a 64-bit BLAKE2b suffices.
+    payload = "\0".join(
+        (USER_FILMS_CACHE_VERSION, "\n".join(lists.watched), "\n".join(lists.watchlist))
+    )
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+    return f"user-films-df-{USER_FILMS_CACHE_VERSION}-{digest}"
 
 
 def user_derived_data_paths(
@@ -116,25 +147,37 @@ def user_derived_data_paths(
     )
 
 
+@lru_cache(maxsize=256)
+def _read_slug_file(path: Path, mtime_ns: int, size: int) -> tuple[str, ...]:
+    # mtime_ns/size only participate in the cache key, so a rewrite is re-read.
+    # Empties are dropped while preserving order.
+    return tuple(s for s in path.read_text().split("\n") if s)
+
+
+def _read_slugs(path: Path) -> list[str]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return []
+    return list(_read_slug_file(path, st.st_mtime_ns, st.st_size))
+
+
 def load_ingested_lists(username: str, *, data_dir: Path | None = None) -> IngestedLists:
-    """Load previously persisted watched/watchlist slugs for a user."""
+    """Load previously persisted watched/watchlist slugs for a user.
+
+    File contents are memoised by (path, mtime, size): a single request can load the
+    same lists several times (recommendations, infographic, dataframe cache).
+    """
 
     paths = user_data_paths(username, data_dir=data_dir)
     if not paths.user_dir.exists():
         raise FileNotFoundError(f"No data found for user '{username}' in {paths.user_dir}")
 
-    watched = (
-        paths.watched_path.read_text().splitlines() if paths.watched_path.exists() else []
+    return IngestedLists(
+        username=username,
+        watched=_read_slugs(paths.watched_path),
+        watchlist=_read_slugs(paths.watchlist_path),
     )
-    watchlist = (
-        paths.watchlist_path.read_text().splitlines() if paths.watchlist_path.exists() else []
-    )
-
-    # Remove empties while preserving order.
-    watched = [s for s in watched if s]
-    watchlist = [s for s in watchlist if s]
-
-    return IngestedLists(username=username, watched=watched, watchlist=watchlist)
 
 
 def build_user_films_df(lists: IngestedLists) -> pd.DataFrame:
@@ -155,38 +198,36 @@ def build_user_films_df(lists: IngestedLists) -> pd.DataFrame:
     watched_pos = {slug: i for i, slug in enumerate(lists.watched)}
     watchlist_pos = {slug: i for i, slug in enumerate(lists.watchlist)}
 
-    all_slugs = list(dict.fromkeys([*lists.watched, *lists.watchlist]))
-
-    rows: list[dict[str, object]] = []
-    for slug in all_slugs:
-        wpos = watched_pos.get(slug)
-        wlpos = watchlist_pos.get(slug)
-
-        rows.append(
-            {
-                "username": lists.username,
-                "film_slug": slug,
-                # Spec-aligned base columns (filled from cached metadata later when available).
-                "film_id": slug,
-                "title": None,
-                "year": None,
-                "director": None,
-                "genres": [],
-                "runtime": None,
-                "country": None,
-                "user_rating": None,
-                "popularity_score": None,
-                "average_rating": None,
-                "keywords_tags": [],
-                "in_watched": wpos is not None,
-                "in_watchlist": wlpos is not None,
-                "watched_position": wpos,
-                "watchlist_position": wlpos,
-            }
-        )
-
-    df = pd.DataFrame.from_records(rows)
-    validate_user_films_df(df)
+    # watched_pos already holds the unique watched slugs in first-seen order.
+    all_slugs = list(watched_pos)
+    all_slugs.extend(slug for slug in watchlist_pos if slug not in watched_pos)
+
+    # Built column-wise: one list per column rather than a dict per row.
+    n = len(all_slugs)
+    wpos = [watched_pos.get(slug) for slug in all_slugs]
+    wlpos = [watchlist_pos.get(slug) for slug in all_slugs]
+    df = pd.DataFrame(
+        {
+            "username": [lists.username] * n,
+            "film_slug": all_slugs,
+            # Spec-aligned base columns (filled from cached metadata later when available).
+            "film_id": all_slugs,
+            "title": [None] * n,
+            "year": [None] * n,
+            "director": [None] * n,
+            "genres": [[] for _ in range(n)],
+            "runtime": [None] * n,
+            "country": [None] * n,
+            "user_rating": [None] * n,
+            "popularity_score": [None] * n,
+            "average_rating": [None] * n,
+            "keywords_tags": [[] for _ in range(n)],
+            "in_watched": [p is not None for p in wpos],
+            "in_watchlist": [p is not None for p in wlpos],
+            "watched_position": wpos,
+            "watchlist_position": wlpos,
+        }
+    )
     return add_basic_features(df)
 
 
@@ -197,26 +238,20 @@ def validate_user_films_df(df: pd.DataFrame) -> None:
 
 
 def _ensure_spec_columns(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    defaults: dict[str, object] = {
-        "film_id": out["film_slug"] if "film_slug" in out.columns else None,
-        "title": None,
-        "year": None,
-        "director": None,
-        "genres": [[] for _ in range(len(out))],
-        "runtime": None,
-        "country": None,
-        "user_rating": None,
-        "popularity_score": None,
-        "average_rating": None,
-        "keywords_tags": [[] for _ in range(len(out))],
-    }
+    """Add any missing spec columns to ``df`` in place (and return it)."""
 
+    n = len(df)
     for col in SPEC_MIN_COLUMNS:
-        if col not in out.columns:
-            out[col] = defaults[col]
+        if col in df.columns:
+            continue
+        if col == "film_id":
+            df[col] = df["film_slug"] if "film_slug" in df.columns else None
+        elif col in ("genres", "keywords_tags"):
+            df[col] = [[] for _ in range(n)]
+        else:
+            df[col] = None
 
-    return out
+    return df
 
 
 @dataclass(frozen=True)
@@ -245,35 +280,38 @@ def add_basic_features(
 
     cfg = config or FeatureEngineeringConfig()
 
-    out = df.copy()
-    validate_user_films_df(out)
-    out = _ensure_spec_columns(out)
+    validate_user_films_df(df)
+    # Only columns are added below, so a shallow copy keeps the caller's frame
+    # untouched without copying its data.
+    out = _ensure_spec_columns(df.copy(deep=False))
+
+    # Feature columns are collected and added in a single assign().
+    features: dict[str, object] = {}
 
     # Positions are 0-indexed; normalize to ~[0, 1]. Missing positions are filled
     # slightly beyond the max position.
     for col in ["watched_position", "watchlist_position"]:
         max_pos = out[col].max(skipna=True)
         if pd.isna(max_pos) or max_pos == 0:
-            out[f"{col}_norm"] = 0.0
+            features[f"{col}_norm"] = 0.0
             continue
 
         fill = cfg.missing_position_fill
         if fill is None:
             fill = float(max_pos) + 1.0
 
-        out[f"{col}_norm"] = out[col].fillna(fill) / float(max_pos)
+        features[f"{col}_norm"] = out[col].fillna(fill) / float(max_pos)
 
-    out["is_candidate"] = out["in_watchlist"] & (~out["in_watched"])
+    in_watched = out["in_watched"].astype(bool)
+    in_watchlist = out["in_watchlist"].astype(bool)
+    features["is_candidate"] = in_watchlist & ~in_watched
 
-    def _label(row: pd.Series) -> str:
-        if bool(row.get("in_watched")):
-            return "watched"
-        if bool(row.get("in_watchlist")):
-            return "watchlist"
-        return "unknown"
-
-    out["interaction"] = out.apply(_label, axis=1)
-    return out
+    # Column-wise rather than a per-row apply; "watched" takes precedence.
+    interaction = pd.Series("unknown", index=out.index, dtype=object)
+    interaction[in_watchlist] = "watchlist"
+    interaction[in_watched] = "watched"
+    features["interaction"] = interaction
+    return out.assign(**features)
 
 
 def load_cached_user_films_df(
@@ -290,15 +328,29 @@ def load_cached_user_films_df(
 
     lists = load_ingested_lists(username, data_dir=data_dir)
     cache_key = user_features_cache_key(lists)
+    df = _load_cached_user_films_df_by_key(username, cache_key=cache_key, data_dir=data_dir)
+    if df is None:
+        return None
+    return cache_key, df
+
+
+def _load_cached_user_films_df_by_key(
+    username: str,
+    *,
+    cache_key: str,
+    data_dir: Path | None,
+) -> pd.DataFrame | None:
     derived = user_derived_data_paths(username, cache_key=cache_key, data_dir=data_dir)
 
     if not derived.user_films_df_path.exists():
         return None
 
-    df = pd.read_json(derived.user_films_df_path, orient="records")
+    # orjson + direct construction skips read_json's own parser and dtype sniffing;
+    # DataFrame() still infers bool/int/float/str per column from the decoded values.
+    payload = orjson.loads(derived.user_films_df_path.read_bytes())
+    df = pd.DataFrame(payload["data"], columns=payload["columns"])
     validate_user_films_df(df)
-    df = _ensure_spec_columns(df)
-    return cache_key, df
+    return _ensure_spec_columns(df)
 
 
 def persist_user_films_df(
@@ -312,8 +364,9 @@ def persist_user_films_df(
     derived.cache_dir.mkdir(parents=True, exist_ok=True)
 
     # JSON is used to preserve basic dtypes (bool/int/float) without requiring
-    # optional parquet backends.
-    df.to_json(derived.user_films_df_path, orient="records", indent=2)
+    # optional parquet backends. "split" stores column names once rather than per row,
+    # and no indentation keeps the file (and its parse) small.
+    df.to_json(derived.user_films_df_path, orient="split", index=False)
 
     manifest = {
         "username": username,
@@ -322,7 +375,9 @@ def persist_user_films_df(
         "row_count": int(df.shape[0]),
         "columns": list(df.columns),
     }
-    derived.manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    derived.manifest_path.write_text(
+        json.dumps(manifest, separators=(",", ":"), sort_keys=True) + "\n"
+    )
 
     return derived
 
@@ -339,9 +394,12 @@ def build_or_load_user_films_df(
     cache_key = user_features_cache_key(lists)
 
     if not force_rebuild:
-        cached = load_cached_user_films_df(username, data_dir=data_dir)
+        # Reuse the lists and key computed above rather than re-reading and re-hashing.
+        cached = _load_cached_user_films_df_by_key(
+            username, cache_key=cache_key, data_dir=data_dir
+        )
         if cached is not None:
-            return cached
+            return cache_key, cached
 
     df = build_user_films_df(lists)
     persist_user_films_df(df, username=username, cache_key=cache_key, data_dir=data_dir)
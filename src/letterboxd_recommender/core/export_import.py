@@ -3,7 +3,12 @@ from __future__ import annotations
 import csv
 import io
 import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
+from functools import partial
+from itertools import chain
+from typing import BinaryIO
 
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists
 
@@ -28,7 +33,16 @@ def _extract_slug_from_url(value: str) -> str | None:
     if not txt:
         return None
 
-    # Accept full URLs and path-ish values.
+    # Fast path for the usual ".../film/<slug>/..." shape: two finds and a slice.
+    i = txt.find("/film/")
+    if i >= 0:
+        start = i + len("/film/")
+        end = txt.find("/", start)
+        slug = (txt[start:end] if end >= 0 else txt[start:]).strip()
+        if slug:
+            return slug
+
+    # Accept other full URLs and path-ish values (e.g. "film/<slug>").
     parts = [p for p in txt.split("/") if p]
     if "film" in parts:
         idx = parts.index("film")
@@ -39,113 +53,147 @@ def _extract_slug_from_url(value: str) -> str | None:
     return None
 
 
-def _parse_csv_rows(csv_bytes: bytes) -> list[dict[str, str]]:
-    text = csv_bytes.decode("utf-8-sig", errors="replace")
-    reader = csv.DictReader(io.StringIO(text))
-    if reader.fieldnames is None:
-        return []
-    return [dict(row) for row in reader]
+# Columns that may hold a film's Letterboxd URL, in order of preference.
+_URL_COLUMNS = ("letterboxd uri", "url", "link", "letterboxd url")
+
+
+@contextmanager
+def _csv_rows(
+    open_csv: Callable[[], BinaryIO],
+) -> Iterator[tuple[dict[str, int], Iterator[list[str]]]]:
+    """Yield (normalised header name -> column index, lazy non-empty data rows).
+
+    The CSV is decoded and parsed as it is read, so a large (possibly still
+    compressed) member never needs to be held in memory as a whole. Headers are
+    normalised once here so per-row lookups are plain list indexing.
+    """
+
+    with io.TextIOWrapper(open_csv(), encoding="utf-8-sig", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            yield {}, iter(())
+            return
+        columns = {_normalise_header(name): i for i, name in enumerate(header)}
+        yield columns, (row for row in reader if row)
 
 
-def _collect_slugs(rows: list[dict[str, str]]) -> list[str]:
-    out: list[str] = []
-    seen: set[str] = set()
+def _collect_slugs(columns: dict[str, int], rows: Iterable[list[str]]) -> list[str]:
+    # Insertion-ordered dict as an ordered set: one hash insert per slug.
+    out: dict[str, None] = {}
+    url_idxs = [columns[c] for c in _URL_COLUMNS if c in columns]
 
     for row in rows:
-        norm = {_normalise_header(k): (v or "") for k, v in row.items()}
-        candidates = [
-            norm.get("letterboxd uri", ""),
-            norm.get("url", ""),
-            norm.get("link", ""),
-            norm.get("letterboxd url", ""),
-        ]
-        slug = None
-        for c in candidates:
-            slug = _extract_slug_from_url(c)
-            if slug:
-                break
+        for i in url_idxs:
+            if i < len(row):
+                slug = _extract_slug_from_url(row[i])
+                if slug:
+                    out[slug] = None
+                    break
 
-        if not slug or slug in seen:
-            continue
-        seen.add(slug)
-        out.append(slug)
+    return list(out)
 
-    return out
+
+def _slugs_from_csv(open_csv: Callable[[], BinaryIO]) -> list[str]:
+    with _csv_rows(open_csv) as (columns, rows):
+        return _collect_slugs(columns, rows)
 
 
-def _all_csv_from_zip(content: bytes) -> dict[str, bytes]:
-    out: dict[str, bytes] = {}
-    with zipfile.ZipFile(io.BytesIO(content)) as zf:
-        for info in zf.infolist():
-            if info.is_dir():
-                continue
-            name = info.filename.rsplit("/", 1)[-1]
-            if not name.lower().endswith(".csv"):
-                continue
-            out[name.lower()] = zf.read(info)
+def _content_size(content: bytes | BinaryIO) -> int:
+    if isinstance(content, bytes):
+        return len(content)
+    size = content.seek(0, io.SEEK_END)
+    content.seek(0)
+    return size
+
+
+def _csv_members(zf: zipfile.ZipFile) -> dict[str, Callable[[], BinaryIO]]:
+    """Map lowercased CSV member names to openers; nothing is decompressed yet."""
+
+    out: dict[str, Callable[[], BinaryIO]] = {}
+    for info in zf.infolist():
+        if info.is_dir():
+            continue
+        name = info.filename.rsplit("/", 1)[-1]
+        if not name.lower().endswith(".csv"):
+            continue
+        out[name.lower()] = partial(zf.open, info)
     return out
 
 
 def import_letterboxd_export(
-    username: str, filename: str, content: bytes
+    username: str, filename: str, content: bytes | BinaryIO
 ) -> ImportedExportData:
+    """Parse a Letterboxd export (.zip or single .csv).
+
+    ``content`` may be the raw bytes or a seekable binary file object (e.g. an
+    upload's spooled temp file), which avoids holding a second copy of a large ZIP.
+    """
+
     if not username.strip():
         raise LetterboxdExportImportError("username is required")
-    if not content:
+    if not _content_size(content):
         raise LetterboxdExportImportError("empty file upload")
 
     lname = filename.lower()
-    csv_files: dict[str, bytes]
-    source = "csv"
-
-    if lname.endswith(".zip"):
-        csv_files = _all_csv_from_zip(content)
-        source = "zip"
-    elif lname.endswith(".csv"):
-        csv_files = {lname.rsplit("/", 1)[-1]: content}
-    else:
-        raise LetterboxdExportImportError("Unsupported file type. Upload .zip or .csv")
-
-    if not csv_files:
-        raise LetterboxdExportImportError("No CSV files found in upload")
-
-    watched_sources = ["diary.csv", "watched.csv", "ratings.csv", "reviews.csv"]
-    watched: list[str] = []
-    seen_watched: set[str] = set()
-
-    for key in watched_sources:
-        rows = _parse_csv_rows(csv_files[key]) if key in csv_files else []
-        for slug in _collect_slugs(rows):
-            if slug in seen_watched:
-                continue
-            seen_watched.add(slug)
-            watched.append(slug)
-
-    watchlist: list[str] = []
-    if "watchlist.csv" in csv_files:
-        watchlist = _collect_slugs(_parse_csv_rows(csv_files["watchlist.csv"]))
-
-    # Remove watchlist entries already watched.
-    watched_set = set(watched)
-    watchlist = [s for s in watchlist if s not in watched_set]
-
-    list_count = 0
-    if "lists.csv" in csv_files:
-        list_rows = _parse_csv_rows(csv_files["lists.csv"])
-        # Unique list names if available, else row count.
-        names = []
-        for row in list_rows:
-            norm = {_normalise_header(k): (v or "") for k, v in row.items()}
-            name = norm.get("name", "").strip()
-            if name:
-                names.append(name)
-        list_count = len(dict.fromkeys(names)) if names else len(list_rows)
-
-    if not watched and not watchlist and not list_count:
-        # If it's a single CSV, try parsing it as watched fallback.
-        if len(csv_files) == 1:
-            only = next(iter(csv_files.values()))
-            watched = _collect_slugs(_parse_csv_rows(only))
+    with ExitStack() as stack:
+        csv_files: dict[str, Callable[[], BinaryIO]]
+        source = "csv"
+
+        if lname.endswith(".zip"):
+            # ZipFile seeks within a file object directly; CSV members are then
+            # decompressed and parsed as a stream, one at a time.
+            zf = stack.enter_context(
+                zipfile.ZipFile(io.BytesIO(content) if isinstance(content, bytes) else content)
+            )
+            csv_files = _csv_members(zf)
+            source = "zip"
+        elif lname.endswith(".csv"):
+            csv_bytes = content if isinstance(content, bytes) else content.read()
+            csv_files = {lname.rsplit("/", 1)[-1]: partial(io.BytesIO, csv_bytes)}
+        else:
+            raise LetterboxdExportImportError("Unsupported file type. Upload .zip or .csv")
+
+        if not csv_files:
+            raise LetterboxdExportImportError("No CSV files found in upload")
+
+        watched_sources = ["diary.csv", "watched.csv", "ratings.csv", "reviews.csv"]
+        watched = list(
+            dict.fromkeys(
+                chain.from_iterable(
+                    _slugs_from_csv(csv_files[key]) for key in watched_sources if key in csv_files
+                )
+            )
+        )
+
+        watchlist: list[str] = []
+        if "watchlist.csv" in csv_files:
+            watchlist = _slugs_from_csv(csv_files["watchlist.csv"])
+
+        # Remove watchlist entries already watched.
+        watched_set = set(watched)
+        watchlist = [s for s in watchlist if s not in watched_set]
+
+        list_count = 0
+        if "lists.csv" in csv_files:
+            with _csv_rows(csv_files["lists.csv"]) as (columns, list_rows):
+                # Unique list names if available, else row count.
+                names: set[str] = set()
+                row_count = 0
+                name_idx = columns.get("name")
+                for row in list_rows:
+                    row_count += 1
+                    if name_idx is not None and name_idx < len(row):
+                        name = row[name_idx].strip()
+                        if name:
+                            names.add(name)
+            list_count = len(names) or row_count
+
+        if not watched and not watchlist and not list_count:
+            # If it's a single CSV, try parsing it as watched fallback.
+            if len(csv_files) == 1:
+                only = next(iter(csv_files.values()))
+                watched = _slugs_from_csv(only)
 
     if not watched and not watchlist:
         raise LetterboxdExportImportError(
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import json
+import os
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock, get_ident
 from typing import Any
 
 import httpx
+import orjson
 
 from letterboxd_recommender.core.letterboxd_ingest import LETTERBOXD_BASE, _default_data_dir
 
@@ -27,10 +31,12 @@ class FilmMetadata:
     average_rating: float | None = None
 
 
-_LD_JSON_RE = re.compile(
-    r"<script[^>]+type=\"application/ld\+json\"[^>]*>(?P<json>.*?)</script>",
-    re.DOTALL | re.IGNORECASE,
-)
+_LD_JSON_TYPE = 'type="application/ld+json"'
+# Literal, case-insensitive tag patterns (HTML tag names are case-insensitive); used
+# with a start position, so the page is still scanned once with no backtracking.
+_SCRIPT_OPEN_RE = re.compile(r"<script", re.IGNORECASE)
+_SCRIPT_CLOSE_RE = re.compile(r"</script>", re.IGNORECASE)
+_ISO_DURATION_RE = re.compile(r"PT(?:(?P<h>\d+)H)?(?:(?P<m>\d+)M)?")
 
 
 def _film_cache_path(slug: str, *, data_dir: Path | None = None) -> Path:
@@ -40,10 +46,19 @@ def _film_cache_path(slug: str, *, data_dir: Path | None = None) -> Path:
 
 def load_cached_film_metadata(slug: str, *, data_dir: Path | None = None) -> FilmMetadata | None:
     path = _film_cache_path(slug, data_dir=data_dir)
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
+    return _read_cached_film_metadata(path, slug, mtime_ns)
+
 
-    raw = json.loads(path.read_text())
+@lru_cache(maxsize=16384)
+def _read_cached_film_metadata(path: Path, slug: str, mtime_ns: int) -> FilmMetadata:
+    # Cache files are read once per modification rather than on every lookup;
+    # mtime_ns only participates in the cache key. Sized so an infographic over a
+    # large watched list (thousands of films) does not cycle the cache.
+    raw = orjson.loads(path.read_bytes())
     return FilmMetadata(
         slug=raw.get("slug") or slug,
         title=raw.get("title"),
@@ -61,7 +76,7 @@ def _parse_iso8601_duration_minutes(value: str | None) -> int | None:
     if not isinstance(value, str):
         return None
 
-    m = re.fullmatch(r"PT(?:(?P<h>\d+)H)?(?:(?P<m>\d+)M)?", value.strip().upper())
+    m = _ISO_DURATION_RE.fullmatch(value.strip().upper())
     if not m:
         return None
 
@@ -92,35 +107,73 @@ def _parse_average_rating(movie: dict[str, Any]) -> float | None:
 
 def persist_film_metadata(meta: FilmMetadata, *, data_dir: Path | None = None) -> Path:
     path = _film_cache_path(meta.slug, data_dir=data_dir)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(asdict(meta), indent=2, sort_keys=True) + "\n")
+    payload = orjson.dumps(
+        asdict(meta),
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+    )
+    # Write to a per-thread temp file and rename over the target, so readers never
+    # see a half-written cache file. The films/ directory is only created on the
+    # first write that finds it missing, not stat'ed/created on every persist.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+    try:
+        try:
+            tmp.write_bytes(payload)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        # Don't leave partial temp files behind (e.g. ENOSPC/EACCES mid-write).
+        tmp.unlink(missing_ok=True)
+        raise
     return path
 
 
+_FETCH_HEADERS = {
+    "User-Agent": "letterboxd-recommender/0.1 (+https://github.com/)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Shared across calls (and threads; httpx.Client is thread-safe) so metadata fills
+# over many films reuse pooled keep-alive connections instead of paying a TCP + TLS
+# handshake per slug.
+_shared_client: httpx.Client | None = None
+_shared_client_lock = Lock()
+
+
+def _get_shared_client() -> httpx.Client:
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = httpx.Client(
+                headers=_FETCH_HEADERS,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+        return _shared_client
+
+
+def close_shared_client() -> None:
+    """Close the pooled client used by ``fetch_film_page`` (e.g. on app shutdown)."""
+
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
 def fetch_film_page(
     slug: str, *, client: httpx.Client | None = None, timeout_s: float = 20.0
 ) -> str:
-    close_client = False
+    url = f"{LETTERBOXD_BASE}/film/{slug}/"
     if client is None:
-        client = httpx.Client(
-            headers={
-                "User-Agent": "letterboxd-recommender/0.1 (+https://github.com/)",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            },
-            timeout=timeout_s,
-            follow_redirects=True,
-        )
-        close_client = True
-
-    try:
-        url = f"{LETTERBOXD_BASE}/film/{slug}/"
+        resp = _get_shared_client().get(url, timeout=timeout_s)
+    else:
         resp = client.get(url)
-        if resp.status_code >= 400:
-            raise FilmMetadataError(f"Failed to fetch film page ({resp.status_code})")
-        return resp.text
-    finally:
-        if close_client:
-            client.close()
+    if resp.status_code >= 400:
+        raise FilmMetadataError(f"Failed to fetch film page ({resp.status_code})")
+    return resp.text
 
 
 def _coerce_list(value: Any) -> list[Any]:
@@ -131,6 +184,62 @@ def _coerce_list(value: Any) -> list[Any]:
     return [value]
 
 
+def _iter_ld_json_blocks(html: str) -> Iterator[str]:
+    # A linear walk over <script> tags: no DOTALL match spanning each script body, and
+    # only the short opening tag is lowercased to check its type.
+    idx = 0
+    while True:
+        start = _SCRIPT_OPEN_RE.search(html, idx)
+        if start is None:
+            return
+        gt = html.find(">", start.end())
+        if gt < 0:
+            return
+        end = _SCRIPT_CLOSE_RE.search(html, gt)
+        if end is None:
+            return
+        if _LD_JSON_TYPE in html[start.start() : gt].lower():
+            yield html[gt + 1 : end.start()]
+        idx = end.end()
+
+
+def _find_ld_json_movie(html: str) -> dict[str, Any] | None:
+    # Blocks are scanned lazily and parsed with orjson; the scan stops at the first
+    # Movie instead of decoding every JSON-LD block on the page.
+    for block in _iter_ld_json_blocks(html):
+        txt = block.strip()
+        if not txt:
+            continue
+        try:
+            payload = orjson.loads(txt)
+        except orjson.JSONDecodeError:
+            continue
+
+        for item in _coerce_list(payload):
+            if not isinstance(item, dict):
+                continue
+            t = item.get("@type")
+            if t == "Movie" or (isinstance(t, list) and "Movie" in t):
+                return item
+    return None
+
+
+def _iter_names(value: Any) -> Iterator[str]:
+    # JSON-LD people/places are either {"name": ...} objects or bare strings.
+    for item in _coerce_list(value):
+        if isinstance(item, dict):
+            name = item.get("name")
+            if isinstance(name, str):
+                yield name.strip()
+        elif isinstance(item, str):
+            yield item.strip()
+
+
+def _dedupe(items: Iterable[str]) -> list[str]:
+    # Drop empties + de-dupe while preserving order, straight from the item stream.
+    return list(dict.fromkeys(it for it in items if it))
+
+
 def parse_film_metadata_from_html(slug: str, html: str) -> FilmMetadata:
     """Extract basic metadata from a Letterboxd film HTML page.
 
@@ -140,27 +249,7 @@ def parse_film_metadata_from_html(slug: str, html: str) -> FilmMetadata:
     This stays dependency-light (no BeautifulSoup).
     """
 
-    candidates: list[dict[str, Any]] = []
-    for m in _LD_JSON_RE.finditer(html):
-        txt = m.group("json").strip()
-        if not txt:
-            continue
-        try:
-            payload = json.loads(txt)
-        except json.JSONDecodeError:
-            continue
-
-        for item in _coerce_list(payload):
-            if isinstance(item, dict):
-                candidates.append(item)
-
-    movie: dict[str, Any] | None = None
-    for c in candidates:
-        t = c.get("@type")
-        if t == "Movie" or (isinstance(t, list) and "Movie" in t):
-            movie = c
-            break
-
+    movie = _find_ld_json_movie(html)
     if movie is None:
         raise FilmMetadataError("No JSON-LD Movie metadata found")
 
@@ -174,43 +263,15 @@ def parse_film_metadata_from_html(slug: str, html: str) -> FilmMetadata:
         except ValueError:
             year = None
 
-    directors: list[str] = []
-    for d in _coerce_list(movie.get("director")):
-        if isinstance(d, dict) and isinstance(d.get("name"), str):
-            directors.append(d["name"].strip())
-        elif isinstance(d, str):
-            directors.append(d.strip())
-
-    genres: list[str] = []
-    for g in _coerce_list(movie.get("genre")):
-        if isinstance(g, str):
-            genres.append(g.strip())
-
-    countries: list[str] = []
-    for c in _coerce_list(movie.get("countryOfOrigin")):
-        if isinstance(c, dict) and isinstance(c.get("name"), str):
-            countries.append(c["name"].strip())
-        elif isinstance(c, str):
-            countries.append(c.strip())
-
-    # Normalise + de-dupe while preserving order.
-    def _dedupe(items: list[str]) -> list[str]:
-        seen: set[str] = set()
-        out: list[str] = []
-        for it in items:
-            if not it or it in seen:
-                continue
-            seen.add(it)
-            out.append(it)
-        return out
+    genres = (g.strip() for g in _coerce_list(movie.get("genre")) if isinstance(g, str))
 
     return FilmMetadata(
         slug=slug,
         title=title.strip() if isinstance(title, str) else None,
         year=year,
-        directors=_dedupe(directors) or None,
+        directors=_dedupe(_iter_names(movie.get("director"))) or None,
         genres=_dedupe(genres) or None,
-        countries=_dedupe(countries) or None,
+        countries=_dedupe(_iter_names(movie.get("countryOfOrigin"))) or None,
         runtime_minutes=_parse_iso8601_duration_minutes(movie.get("duration")),
         average_rating=_parse_average_rating(movie),
     )
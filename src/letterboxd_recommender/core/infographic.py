@@ -1,21 +1,31 @@
 from __future__ import annotations
 
 from collections import Counter
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
+from threading import Lock
 from typing import Literal
 
-from letterboxd_recommender.core.dataframe import load_ingested_lists
+from letterboxd_recommender.core.dataframe import (
+    load_ingested_lists,
+    recommendation_cache_epoch,
+    user_data_version,
+)
 from letterboxd_recommender.core.film_metadata import (
     FilmMetadata,
     FilmMetadataError,
     get_film_metadata,
+    load_cached_film_metadata,
 )
 
 ListKind = Literal["watched", "watchlist", "all"]
 INFOGRAPHIC_SAMPLE_LIMIT = 50
 METADATA_FAILURE_BREAK_THRESHOLD = 8
+METADATA_FETCH_CONCURRENCY = 8
 
 
 @dataclass(frozen=True)
@@ -37,16 +47,76 @@ def _decade_label(year: int) -> str:
     return f"{decade}s"
 
 
+_RUNTIME_BUCKET_ORDER = ("<90m", "90-109m", "110-129m", "130-149m", "150m+")
+# Bucket edges are all multiples of 10 minutes, so the label is a lookup by
+# runtime // 10 (clamped) rather than a comparison cascade.
+_RUNTIME_BUCKETS = (
+    ("<90m",) * 9 + ("90-109m",) * 2 + ("110-129m",) * 2 + ("130-149m",) * 2 + ("150m+",)
+)
+_LAST_RUNTIME_BUCKET = len(_RUNTIME_BUCKETS) - 1
+
+
 def _runtime_bucket_label(runtime_minutes: int) -> str:
-    if runtime_minutes < 90:
-        return "<90m"
-    if runtime_minutes < 110:
-        return "90-109m"
-    if runtime_minutes < 130:
-        return "110-129m"
-    if runtime_minutes < 150:
-        return "130-149m"
-    return "150m+"
+    return _RUNTIME_BUCKETS[min(max(runtime_minutes // 10, 0), _LAST_RUNTIME_BUCKET)]
+
+
+def _fetch_or_none(provider: Callable[[str], FilmMetadata], slug: str) -> FilmMetadata | None:
+    try:
+        return provider(slug)
+    except FilmMetadataError:
+        return None
+
+
+# One bounded pool shared by every summary build (which already runs on the API's
+# io executor), rather than a pool per call.
+_fetch_executor: ThreadPoolExecutor | None = None
+_fetch_executor_lock = Lock()
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=METADATA_FETCH_CONCURRENCY, thread_name_prefix="film-metadata"
+            )
+        return _fetch_executor
+
+
+def shutdown_fetch_executor() -> None:
+    """Shut down the shared metadata fetch pool (e.g. on app shutdown)."""
+
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is not None:
+            _fetch_executor.shutdown(wait=False)
+            _fetch_executor = None
+
+
+def _iter_metadata(
+    slugs: list[str],
+    provider: Callable[[str], FilmMetadata],
+    lookup_cached: Callable[[str], FilmMetadata | None] | None = None,
+) -> Iterator[FilmMetadata | None]:
+    """Yield metadata for ``slugs`` in order (None where it cannot be fetched/parsed).
+
+    Each batch is first probed with ``lookup_cached`` (if given); only the misses are
+    network-bound, so only they are fetched concurrently on the shared pool. Batches
+    are handled as the caller consumes them, so breaking out early still stops
+    further fetches.
+    """
+
+    for start in range(0, len(slugs), METADATA_FETCH_CONCURRENCY):
+        batch = slugs[start : start + METADATA_FETCH_CONCURRENCY]
+        cached = [lookup_cached(slug) for slug in batch] if lookup_cached else [None] * len(batch)
+        misses = [slug for slug, meta in zip(batch, cached, strict=True) if meta is None]
+        fetched = (
+            _get_fetch_executor().map(partial(_fetch_or_none, provider), misses)
+            if misses
+            else iter(())
+        )
+        for meta in cached:
+            yield meta if meta is not None else next(fetched)
 
 
 def build_infographic_summary(
@@ -73,63 +143,59 @@ def build_infographic_summary(
     elif list_kind == "watchlist":
         slugs = lists.watchlist
     elif list_kind == "all":
-        slugs = list(dict.fromkeys([*lists.watched, *lists.watchlist]))
+        slugs = list(dict.fromkeys(chain(lists.watched, lists.watchlist)))
     else:
         raise ValueError(f"Unknown list_kind: {list_kind}")
 
     provider = metadata_provider or (lambda slug: get_film_metadata(slug, data_dir=data_dir))
+    # Cache hits are served inline; an injected provider is used for every film.
+    lookup_cached = (
+        None if metadata_provider else partial(load_cached_film_metadata, data_dir=data_dir)
+    )
 
     genre_counts: Counter[str] = Counter()
     decade_counts: Counter[str] = Counter()
     director_counts: Counter[str] = Counter()
     runtime_counts: Counter[str] = Counter()
-    runtimes: list[int] = []
-    global_ratings: list[float] = []
+    # Running totals; the per-film values themselves are never needed.
+    runtime_sum = 0
+    runtime_n = 0
+    rating_sum = 0.0
+    rating_n = 0
 
     metadata_failures = 0
-    for slug in slugs[:INFOGRAPHIC_SAMPLE_LIMIT]:
-        try:
-            meta = provider(slug)
-        except FilmMetadataError:
+    for meta in _iter_metadata(slugs[:INFOGRAPHIC_SAMPLE_LIMIT], provider, lookup_cached):
+        if meta is None:
             # Gracefully skip films that cannot be parsed/fetched.
             metadata_failures += 1
             if metadata_failures >= METADATA_FAILURE_BREAK_THRESHOLD:
                 break
             continue
 
-        for g in meta.genres or []:
-            genre_counts[g] += 1
+        genre_counts.update(meta.genres or ())
 
         if meta.year is not None:
             decade_counts[_decade_label(meta.year)] += 1
 
-        for d in meta.directors or []:
-            director_counts[d] += 1
+        director_counts.update(meta.directors or ())
 
         if meta.runtime_minutes is not None:
-            runtimes.append(meta.runtime_minutes)
+            runtime_sum += meta.runtime_minutes
+            runtime_n += 1
             runtime_counts[_runtime_bucket_label(meta.runtime_minutes)] += 1
 
         if meta.average_rating is not None:
-            global_ratings.append(meta.average_rating)
+            rating_sum += meta.average_rating
+            rating_n += 1
 
-    runtime_bucket_order = ["<90m", "90-109m", "110-129m", "130-149m", "150m+"]
     runtime_distribution = [
         (label, runtime_counts.get(label, 0))
-        for label in runtime_bucket_order
+        for label in _RUNTIME_BUCKET_ORDER
         if runtime_counts.get(label, 0) > 0
     ]
 
-    avg_runtime = (
-        (sum(runtimes) / float(len(runtimes)))
-        if runtimes
-        else None
-    )
-    avg_global = (
-        (sum(global_ratings) / float(len(global_ratings)))
-        if global_ratings
-        else None
-    )
+    avg_runtime = runtime_sum / runtime_n if runtime_n else None
+    avg_global = rating_sum / rating_n if rating_n else None
 
     return InfographicSummary(
         username=username,
@@ -144,3 +210,36 @@ def build_infographic_summary(
         average_user_rating=None,
         average_global_rating=avg_global,
     )
+
+
+@lru_cache(maxsize=1024)
+def _cached_summary(
+    username: str, list_kind: ListKind, top_n: int, data_version: str, ttl_bucket: int
+) -> InfographicSummary:
+    # data_version and ttl_bucket only participate in the cache key.
+    return build_infographic_summary(username, list_kind=list_kind, top_n=top_n)
+
+
+def cached_infographic_summary(
+    username: str,
+    *,
+    list_kind: ListKind = "watched",
+    top_n: int = 10,
+    data_version: str | None = None,
+    ttl_bucket: int | None = None,
+) -> tuple[str, InfographicSummary]:
+    """Return ``(data_version, summary)``, reusing the summary until the lists change.
+
+    The cache is keyed by ``user_data_version``, so an ingest that rewrites the
+    user's lists invalidates it. Entries also expire with the recommendation cache
+    epoch (``RECOMMEND_CACHE_TTL_S``): films whose metadata could not be fetched are
+    skipped, so a summary built during an upstream outage must not outlive it.
+    Pass ``data_version``/``ttl_bucket`` if the caller already computed them (e.g. for
+    an ETag). Uses the default data dir.
+    """
+
+    if data_version is None:
+        data_version = user_data_version(username)
+    if ttl_bucket is None:
+        ttl_bucket = recommendation_cache_epoch()
+    return data_version, _cached_summary(username, list_kind, top_n, data_version, ttl_bucket)
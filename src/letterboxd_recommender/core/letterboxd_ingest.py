@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import os
 import re
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
 
 import httpx
 
@@ -26,7 +28,13 @@ class IngestedLists:
     watchlist: list[str]
 
 
-_FILM_PATH_RE = re.compile(r"^/film/(?P<slug>[^/]+)/?$")
+# <link>https://letterboxd.com/film/<slug>/</link>, plus user-scoped film log URLs:
+#   /<username>/film/<slug>/
+#   /<username>/film/<slug>/1/
+_RSS_FILM_LINK_RE = re.compile(
+    r"<link>\s*(?:https?://[^/<\s]+)?(?:/[^/<\s]+)?/film/([^/<\s]+)[^<]*</link>",
+    re.IGNORECASE,
+)
 
 
 def _rss_url(username: str, kind: str) -> str:
@@ -40,56 +48,25 @@ def _rss_url(username: str, kind: str) -> str:
     raise ValueError(f"Unknown kind: {kind}")
 
 
-def _extract_film_slug_from_link(link: str) -> str | None:
-    try:
-        path = httpx.URL(link).path
-    except Exception:
-        return None
-
-    m = _FILM_PATH_RE.match(path)
-    if m:
-        return m.group("slug")
-
-    # Also support user-scoped film log URLs:
-    #   /<username>/film/<slug>/
-    #   /<username>/film/<slug>/1/
-    parts = [p for p in path.split("/") if p]
-    if "film" in parts:
-        idx = parts.index("film")
-        if idx + 1 < len(parts):
-            slug = parts[idx + 1].strip()
-            if slug:
-                return slug
-    return None
-
-
 def parse_letterboxd_rss(xml_text: str) -> list[str]:
     """Parse a Letterboxd RSS feed and return film slugs.
 
-    Keeps order but removes duplicates.
+    Keeps order but removes duplicates. Only the slugs are needed, so the item links are
+    matched directly in the raw text rather than building an XML tree.
     """
 
-    root = ET.fromstring(xml_text)
-
-    # RSS 2.0: <rss><channel><item> ... <link>https://letterboxd.com/film/slug/</link>
-    slugs: list[str] = []
-    seen: set[str] = set()
+    return list(dict.fromkeys(_RSS_FILM_LINK_RE.findall(xml_text)))
 
-    for item in root.findall("./channel/item"):
-        link_el = item.find("link")
-        if link_el is None or not link_el.text:
-            continue
-        slug = _extract_film_slug_from_link(link_el.text.strip())
-        if not slug or slug in seen:
-            continue
-        seen.add(slug)
-        slugs.append(slug)
 
-    return slugs
+def _default_data_dir() -> Path:
+    # The env var is still read per call (tests and deploys can change it); only the
+    # resolve(), which walks the filesystem, is memoised.
+    return _resolve_data_dir(os.environ.get("LETTERBOXD_RECOMMENDER_DATA_DIR", "data"))
 
 
-def _default_data_dir() -> Path:
-    return Path(os.environ.get("LETTERBOXD_RECOMMENDER_DATA_DIR", "data")).resolve()
+@lru_cache(maxsize=8)
+def _resolve_data_dir(raw: str) -> Path:
+    return Path(raw).resolve()
 
 
 def persist_ingest(result: IngestedLists, *, data_dir: Path | None = None) -> Path:
@@ -113,6 +90,34 @@ def persist_ingest(result: IngestedLists, *, data_dir: Path | None = None) -> Pa
     return user_dir
 
 
+# Bounded pool shared by all ingests (which already run on the API's io executor)
+# for the concurrently fetched watched feed; see ingest_user.
+RSS_FETCH_CONCURRENCY = 4
+
+_rss_executor: ThreadPoolExecutor | None = None
+_rss_executor_lock = Lock()
+
+
+def _get_rss_executor() -> ThreadPoolExecutor:
+    global _rss_executor
+    with _rss_executor_lock:
+        if _rss_executor is None:
+            _rss_executor = ThreadPoolExecutor(
+                max_workers=RSS_FETCH_CONCURRENCY, thread_name_prefix="letterboxd-rss"
+            )
+        return _rss_executor
+
+
+def shutdown_rss_executor() -> None:
+    """Shut down the shared RSS fetch pool (e.g. on app shutdown)."""
+
+    global _rss_executor
+    with _rss_executor_lock:
+        if _rss_executor is not None:
+            _rss_executor.shutdown(wait=False)
+            _rss_executor = None
+
+
 def ingest_user(
     username: str,
     *,
@@ -135,8 +140,19 @@ def ingest_user(
 
     try:
         try:
-            watched_xml = _fetch_rss(client, _rss_url(username, "watched"))
-            watchlist_xml = _fetch_rss(client, _rss_url(username, "watchlist"))
+            # The two feeds are independent, so the watched feed is fetched on the
+            # shared RSS pool while this thread fetches the watchlist, over the same
+            # (thread-safe, pooled) client. Errors are checked watched-first, matching
+            # the order they would surface in sequentially.
+            watched_future = _get_rss_executor().submit(
+                _fetch_rss, client, _rss_url(username, "watched")
+            )
+            try:
+                watchlist_xml = _fetch_rss(client, _rss_url(username, "watchlist"))
+            except Exception:
+                watched_future.result()
+                raise
+            watched_xml = watched_future.result()
             watched = parse_letterboxd_rss(watched_xml)
             watchlist = parse_letterboxd_rss(watchlist_xml)
             return IngestedLists(username=username, watched=watched, watchlist=watchlist)
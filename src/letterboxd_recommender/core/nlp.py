@@ -38,16 +38,30 @@ class RefinementParseResult:
 
 
 _GENRE_SPLIT_RE = re.compile(r"\s*(?:,|/|\band\b|\bor\b)\s*", flags=re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+_K_RE = re.compile(r"^\s*(\d{1,2})\b")
+_YEAR_RE = re.compile(r"\d{4}")
+_BETWEEN_YEARS_RE = re.compile(r"\b(?:between|from)\s+(\d{4})\s+(?:and|to)\s+(\d{4})\b")
+_IN_YEAR_RE = re.compile(r"\bin\s+(\d{4})\b")
+_BEFORE_YEAR_RE = re.compile(r"\b(?:before|earlier\s+than|prior\s+to)\s+(\d{4})\b")
+_AFTER_YEAR_RE = re.compile(r"\bafter\s+(\d{4})\b")
+_SINCE_YEAR_RE = re.compile(r"\b(?:since|from)\s+(\d{4})\b")
+_GENRE_SUFFIX_RE = re.compile(r"\b([a-z][a-z\-\s/,&]+?)\s+genre\b")
+_GENRE_FROM_IN_RE = re.compile(r"\b(?:from|in)\s+([a-z][a-z\-\s/,&]+)\b")
+_COUNTRY_FROM_RE = re.compile(
+    r"\bfrom\s+([a-z][a-z\s]+?)\b(?:\s+(?:films|movies|cinema|country)\b|$)"
+)
+_COUNTRY_CINEMA_RE = re.compile(r"\b([a-z][a-z\s]+?)\s+cinema\b")
 
 
 def _normalise_token(token: str) -> str:
     token = token.strip().lower()
-    token = re.sub(r"\s+", " ", token)
+    token = _WS_RE.sub(" ", token)
     return token
 
 
 def _parse_k(prompt: str) -> int | None:
-    match = re.match(r"^\s*(\d{1,2})\b", prompt)
+    match = _K_RE.match(prompt)
     if not match:
         return None
 
@@ -60,29 +74,29 @@ def _parse_k(prompt: str) -> int | None:
 def _parse_year_bounds(prompt: str) -> tuple[int | None, int | None]:
     p = prompt.lower()
 
-    between = re.search(r"\b(?:between|from)\s+(\d{4})\s+(?:and|to)\s+(\d{4})\b", p)
+    between = _BETWEEN_YEARS_RE.search(p)
     if between:
         y1 = int(between.group(1))
         y2 = int(between.group(2))
         lo, hi = sorted((y1, y2))
         return lo, hi
 
-    in_year = re.search(r"\bin\s+(\d{4})\b", p)
+    in_year = _IN_YEAR_RE.search(p)
     if in_year:
         y = int(in_year.group(1))
         return y, y
 
-    before = re.search(r"\b(?:before|earlier\s+than|prior\s+to)\s+(\d{4})\b", p)
+    before = _BEFORE_YEAR_RE.search(p)
     if before:
         y = int(before.group(1))
         return None, y - 1
 
-    after = re.search(r"\bafter\s+(\d{4})\b", p)
+    after = _AFTER_YEAR_RE.search(p)
     if after:
         y = int(after.group(1))
         return y + 1, None
 
-    since = re.search(r"\b(?:since|from)\s+(\d{4})\b", p)
+    since = _SINCE_YEAR_RE.search(p)
     if since:
         y = int(since.group(1))
         return y, None
@@ -118,13 +132,13 @@ def _parse_include_genres(prompt: str) -> tuple[str, ...]:
     p = prompt.lower()
 
     # e.g. "action genre", "sci-fi genre"
-    match = re.search(r"\b([a-z][a-z\-\s/,&]+?)\s+genre\b", p)
+    match = _GENRE_SUFFIX_RE.search(p)
     if not match:
         # e.g. "from action" or "in action" (heuristic: only if "genre" appears anywhere)
         if "genre" not in p:
             return ()
 
-        match = re.search(r"\b(?:from|in)\s+([a-z][a-z\-\s/,&]+)\b", p)
+        match = _GENRE_FROM_IN_RE.search(p)
         if not match:
             return ()
 
@@ -143,15 +157,7 @@ def _parse_include_genres(prompt: str) -> tuple[str, ...]:
     # Drop generic words.
     parts = [p for p in parts if p not in {"a", "an", "the", "movies", "films"}]
     # Deduplicate while preserving order.
-    seen: set[str] = set()
-    out: list[str] = []
-    for item in parts:
-        if item in seen:
-            continue
-        seen.add(item)
-        out.append(item)
-
-    return tuple(out)
+    return tuple(dict.fromkeys(parts))
 
 
 def _parse_include_countries(prompt: str) -> tuple[str, ...]:
@@ -162,12 +168,12 @@ def _parse_include_countries(prompt: str) -> tuple[str, ...]:
         return ()
 
     # e.g. "from South Korea", "korean cinema"
-    match = re.search(r"\bfrom\s+([a-z][a-z\s]+?)\b(?:\s+(?:films|movies|cinema|country)\b|$)", p)
+    match = _COUNTRY_FROM_RE.search(p)
     if match:
         country = _normalise_token(match.group(1))
         return (country,) if country else ()
 
-    match = re.search(r"\b([a-z][a-z\s]+?)\s+cinema\b", p)
+    match = _COUNTRY_CINEMA_RE.search(p)
     if match:
         country = _normalise_token(match.group(1))
         return (country,) if country else ()
@@ -195,9 +201,12 @@ def parse_refinement_prompt(prompt: str | None) -> RefinementParseResult:
 
     intent: RefinementIntent = "more" if "more" in lowered else "refine"
 
-    k = _parse_k(raw)
-    year_min, year_max = _parse_year_bounds(raw)
-    include_genres = _parse_include_genres(raw)
+    # Most prompts carry few (if any) constraints, so the regex-based sub-parsers are
+    # skipped when the prompt lacks the text they need (the country and similar-to
+    # parsers check their own hints first).
+    k = _parse_k(raw) if raw[0].isdigit() else None
+    year_min, year_max = _parse_year_bounds(raw) if _YEAR_RE.search(raw) else (None, None)
+    include_genres = _parse_include_genres(raw) if "genre" in lowered else ()
     include_countries = _parse_include_countries(raw)
     similar_to_title = _parse_similar_to_title(raw)
 
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 
-from letterboxd_recommender.core.dataframe import load_ingested_lists
+from letterboxd_recommender.core.dataframe import (
+    load_ingested_lists,
+    recommendation_cache_epoch,
+    user_data_version,
+)
 from letterboxd_recommender.core.film_metadata import (
     FilmMetadata,
     FilmMetadataError,
     get_film_metadata,
+    load_cached_film_metadata,
 )
 from letterboxd_recommender.core.nlp import RefinementConstraints, parse_refinement_prompt
 
@@ -414,7 +422,7 @@ def recommend_for_user(
     *,
     k: int = 5,
     prompt: str | None = None,
-    exclude_slugs: set[str] | None = None,
+    exclude_slugs: AbstractSet[str] | None = None,
     data_dir: Path | None = None,
     metadata_provider: Callable[[str], FilmMetadata] | None = None,
 ) -> list[RecommendationItem]:
@@ -431,7 +439,7 @@ def recommend_for_user(
     Args:
         prompt: currently ignored (reserved for later milestones)
         exclude_slugs: optional additional slugs to exclude (e.g. already recommended
-            within the current session).
+            within the current session). Read only; never copied or modified.
         metadata_provider: override for tests; signature (slug: str) -> FilmMetadata
     """
 
@@ -449,13 +457,15 @@ def recommend_for_user(
     lists = load_ingested_lists(username, data_dir=data_dir)
     exclude = set(lists.watched) | set(lists.watchlist)
     if exclude_slugs:
-        exclude |= set(exclude_slugs)
+        exclude |= exclude_slugs
 
     provider = metadata_provider or (lambda slug: get_film_metadata(slug, data_dir=data_dir))
 
     similar_meta: FilmMetadata | None = None
     if constraints.similar_to_title:
-        search_space = list(dict.fromkeys([*lists.watched, *lists.watchlist, *POPULAR_FILM_SLUGS]))
+        search_space = list(
+            dict.fromkeys(chain(lists.watched, lists.watchlist, POPULAR_FILM_SLUGS))
+        )
         resolved = _resolve_similar_to_slug(
             constraints.similar_to_title,
             candidates=search_space,
@@ -547,3 +557,54 @@ def recommend_for_user(
         it for _, _, has, it in candidates if not has
     ]
     return fallback[:k]
+
+
+def warm_candidate_metadata(*, data_dir: Path | None = None) -> int:
+    """Load cached metadata for the popular candidate pool into memory.
+
+    Only reads the on-disk film cache (never fetches), so it is cheap and safe to run
+    at startup. Returns the number of films found.
+    """
+
+    return sum(
+        load_cached_film_metadata(slug, data_dir=data_dir) is not None
+        for slug in POPULAR_FILM_SLUGS
+    )
+
+
+@lru_cache(maxsize=512)
+def _cached_recommendations(
+    username: str,
+    k: int,
+    prompt: str | None,
+    exclude_slugs: frozenset[str],
+    data_version: str,
+    ttl_bucket: int,
+) -> tuple[RecommendationItem, ...]:
+    # data_version and ttl_bucket only participate in the cache key.
+    return tuple(
+        recommend_for_user(username, k=k, prompt=prompt, exclude_slugs=exclude_slugs)
+    )
+
+
+def cached_recommend_for_user(
+    username: str,
+    *,
+    k: int = 5,
+    prompt: str | None = None,
+    exclude_slugs: AbstractSet[str] | None = None,
+) -> list[RecommendationItem]:
+    """Memoised ``recommend_for_user`` using the default data dir and metadata.
+
+    Results are keyed by the request arguments plus ``user_data_version``, so a new
+    ingest invalidates them, and expire after ``RECOMMEND_CACHE_TTL_S``.
+    """
+
+    data_version = user_data_version(username)
+    ttl_bucket = recommendation_cache_epoch()
+    # The one copy needed to make the exclusions hashable for the cache key
+    # (frozenset() of a frozenset returns it as-is).
+    exclude = frozenset(exclude_slugs or ())
+    return list(
+        _cached_recommendations(username, k, prompt, exclude, data_version, ttl_bucket)
+    )
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from fastapi.testclient import TestClient
+
+from letterboxd_recommender.api.app import create_app
 from letterboxd_recommender.core.dataframe import (
     build_or_load_user_films_df,
     user_derived_data_paths,
@@ -43,3 +46,20 @@ def test_user_features_cache_key_changes_when_lists_change(tmp_path: Path) -> No
     key2, _ = build_or_load_user_films_df("bob", data_dir=tmp_path, force_rebuild=True)
 
     assert key2 != key1
+
+
+def test_startup_warms_configured_users(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_WARM_USERS", "alice,missing")
+    persist_ingest(
+        IngestedLists(username="alice", watched=["a"], watchlist=[]), data_dir=tmp_path
+    )
+
+    with TestClient(create_app()) as client:
+        assert client.get("/health").status_code == 200
+
+    cache_key = user_features_cache_key(
+        IngestedLists(username="alice", watched=["a"], watchlist=[])
+    )
+    derived = user_derived_data_paths("alice", cache_key=cache_key, data_dir=tmp_path)
+    assert derived.user_films_df_path.exists()
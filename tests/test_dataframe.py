@@ -70,3 +70,18 @@ def test_load_ingested_lists_roundtrip(tmp_path: Path) -> None:
     df = build_user_films_df(loaded)
     assert isinstance(df, pd.DataFrame)
     assert set(df["film_slug"]) == {"x", "y", "z"}
+
+
+def test_load_ingested_lists_rereads_after_new_ingest(tmp_path: Path) -> None:
+    persist_ingest(IngestedLists(username="bob", watched=["x"], watchlist=[]), data_dir=tmp_path)
+    first = load_ingested_lists("bob", data_dir=tmp_path)
+    first.watched.append("mutated")  # callers get their own lists, not the cached tuple
+
+    assert load_ingested_lists("bob", data_dir=tmp_path).watched == ["x"]
+
+    persist_ingest(
+        IngestedLists(username="bob", watched=["x", "y"], watchlist=["z"]), data_dir=tmp_path
+    )
+    reloaded = load_ingested_lists("bob", data_dir=tmp_path)
+    assert reloaded.watched == ["x", "y"]
+    assert reloaded.watchlist == ["z"]
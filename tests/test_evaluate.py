@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -7,6 +8,8 @@ from fastapi.testclient import TestClient
 from letterboxd_recommender.api.app import create_app
 from letterboxd_recommender.core.film_metadata import FilmMetadata
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists, persist_ingest
+from letterboxd_recommender.core.recommender import FeatureContribution, RecommendationItem
+from letterboxd_recommender.core.schemas import FeatureContributionItem, Recommendation
 
 
 def _meta(slug: str) -> FilmMetadata:
@@ -83,3 +86,13 @@ def test_evaluate_endpoint_404_if_user_not_ingested(tmp_path: Path, monkeypatch)
         "/api/evaluate", json={"username": "missing-user", "film_id": "cand-1"}
     )
     assert resp.status_code == 404
+
+
+def test_core_result_dataclasses_mirror_response_schemas() -> None:
+    # The API serializes these dataclasses directly, so their fields are the wire format.
+    assert [f.name for f in dataclasses.fields(RecommendationItem)] == list(
+        Recommendation.model_fields
+    )
+    assert [f.name for f in dataclasses.fields(FeatureContribution)] == list(
+        FeatureContributionItem.model_fields
+    )
@@ -53,3 +53,24 @@ def test_import_letterboxd_single_csv() -> None:
     assert imported.source == "csv"
     assert imported.lists.watched == ["alien"]
     assert imported.lists.watchlist == []
+
+
+def test_import_letterboxd_zip_from_file_object() -> None:
+    data = _zip_bytes(
+        {"watched.csv": "Name,Letterboxd URI\nAlien,https://letterboxd.com/film/alien/\n"}
+    )
+
+    imported = import_letterboxd_export("alice", "export.zip", io.BytesIO(data))
+    assert imported.source == "zip"
+    assert imported.lists.watched == ["alien"]
+
+
+def test_extract_slug_from_url_shapes() -> None:
+    from letterboxd_recommender.core.export_import import _extract_slug_from_url
+
+    assert _extract_slug_from_url("https://letterboxd.com/film/alien/") == "alien"
+    assert _extract_slug_from_url("https://letterboxd.com/alice/film/heat/1/") == "heat"
+    assert _extract_slug_from_url("https://letterboxd.com/film/dune") == "dune"
+    assert _extract_slug_from_url("film/parasite") == "parasite"
+    assert _extract_slug_from_url("https://letterboxd.com/film/") is None
+    assert _extract_slug_from_url("https://boxd.it/abc") is None
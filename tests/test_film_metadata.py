@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from letterboxd_recommender.core.film_metadata import parse_film_metadata_from_html
+from pathlib import Path
+
+import pytest
+
+from letterboxd_recommender.core.film_metadata import (
+    FilmMetadata,
+    load_cached_film_metadata,
+    parse_film_metadata_from_html,
+    persist_film_metadata,
+)
+from letterboxd_recommender.core.recommender import warm_candidate_metadata
 
 
 def test_parse_film_metadata_extracts_runtime_and_average_rating() -> None:
@@ -32,3 +42,38 @@ def test_parse_film_metadata_extracts_runtime_and_average_rating() -> None:
     assert meta.year == 1995
     assert meta.runtime_minutes == 170
     assert meta.average_rating == 4.2
+
+
+def test_parse_film_metadata_matches_script_tags_case_insensitively() -> None:
+    html = """<html><HEAD>
+<Script src="/app.js"></Script>
+<SCRIPT TYPE="application/ld+json">{"@type": "Movie", "name": "Alien"}</Script>
+</HEAD></html>"""
+
+    meta = parse_film_metadata_from_html("alien", html)
+    assert meta.title == "Alien"
+
+
+def test_cached_film_metadata_is_memoised_until_rewritten(tmp_path: Path) -> None:
+    persist_film_metadata(FilmMetadata(slug="alien", title="Alien"), data_dir=tmp_path)
+
+    assert warm_candidate_metadata(data_dir=tmp_path) == 1
+    first = load_cached_film_metadata("alien", data_dir=tmp_path)
+    assert first is load_cached_film_metadata("alien", data_dir=tmp_path)
+
+    persist_film_metadata(FilmMetadata(slug="alien", title="Alien (1979)"), data_dir=tmp_path)
+    again = load_cached_film_metadata("alien", data_dir=tmp_path)
+    assert again is not None and again.title == "Alien (1979)"
+    assert load_cached_film_metadata("missing", data_dir=tmp_path) is None
+
+
+def test_persist_film_metadata_removes_temp_file_on_failure(tmp_path: Path, monkeypatch) -> None:
+    def fail_replace(src, dst) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("letterboxd_recommender.core.film_metadata.os.replace", fail_replace)
+
+    with pytest.raises(OSError):
+        persist_film_metadata(FilmMetadata(slug="alien", title="Alien"), data_dir=tmp_path)
+
+    assert list((tmp_path / "films").iterdir()) == []
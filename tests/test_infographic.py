@@ -5,8 +5,15 @@ from pathlib import Path
 from fastapi.testclient import TestClient
 
 from letterboxd_recommender.api.app import create_app
-from letterboxd_recommender.core.film_metadata import FilmMetadata, FilmMetadataError
-from letterboxd_recommender.core.infographic import build_infographic_summary
+from letterboxd_recommender.core.film_metadata import (
+    FilmMetadata,
+    FilmMetadataError,
+    persist_film_metadata,
+)
+from letterboxd_recommender.core.infographic import (
+    build_infographic_summary,
+    cached_infographic_summary,
+)
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists, persist_ingest
 
 
@@ -131,3 +138,162 @@ def test_build_infographic_summary_skips_unavailable_film_metadata(
 
     assert summary.film_count == 2
     assert dict(summary.top_directors) == {"Ridley Scott": 1}
+
+
+def test_infographic_endpoint_caches_until_lists_change(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+
+    calls: list[str] = []
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        calls.append(slug)
+        return _fake_meta(slug)
+
+    monkeypatch.setattr("letterboxd_recommender.core.infographic.get_film_metadata", meta)
+
+    client = TestClient(create_app())
+
+    r1 = client.get("/api/users/alice/infographic")
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+
+    r2 = client.get("/api/users/alice/infographic", headers={"if-none-match": etag})
+    assert r2.status_code == 304
+    assert calls == ["alien"]
+
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien", "heat"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+
+    r3 = client.get("/api/users/alice/infographic", headers={"if-none-match": etag})
+    assert r3.status_code == 200
+    assert r3.headers["etag"] != etag
+    assert r3.json()["film_count"] == 2
+
+
+def test_infographic_endpoint_rejects_unknown_list_kind() -> None:
+    resp = TestClient(create_app()).get("/api/users/alice/infographic?list_kind=diary")
+    assert resp.status_code == 422
+
+
+def test_infographic_endpoint_serves_pregzipped_payload(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien", "heat"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.infographic.get_film_metadata",
+        lambda slug, **_: _fake_meta(slug),
+    )
+
+    client = TestClient(create_app())
+    gz = client.get("/api/users/alice/infographic", headers={"accept-encoding": "gzip"})
+    raw = client.get("/api/users/alice/infographic", headers={"accept-encoding": "identity"})
+
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in raw.headers
+    assert gz.json() == raw.json()
+    assert raw.json()["film_count"] == 2
+
+
+def test_cached_summary_with_unavailable_metadata_expires_with_epoch(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+
+    outage = True
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        if outage:
+            raise FilmMetadataError("rate limited")
+        return _fake_meta(slug)
+
+    epoch = 1000
+    monkeypatch.setattr("letterboxd_recommender.core.infographic.get_film_metadata", meta)
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.infographic.recommendation_cache_epoch", lambda: epoch
+    )
+
+    _, degraded = cached_infographic_summary("alice")
+    assert degraded.top_directors == []
+
+    outage = False
+    _, same_epoch = cached_infographic_summary("alice")
+    assert same_epoch is degraded
+
+    epoch += 1
+    _, recovered = cached_infographic_summary("alice")
+    assert dict(recovered.top_directors) == {"Ridley Scott": 1}
+
+
+def test_infographic_endpoint_rebuilds_in_next_cache_epoch(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+
+    outage = True
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        if outage:
+            raise FilmMetadataError("rate limited")
+        return _fake_meta(slug)
+
+    epoch = 2000
+    monkeypatch.setattr("letterboxd_recommender.core.infographic.get_film_metadata", meta)
+    monkeypatch.setattr(
+        "letterboxd_recommender.api.routes.recommendation_cache_epoch", lambda: epoch
+    )
+
+    client = TestClient(create_app())
+    degraded = client.get("/api/users/alice/infographic")
+    assert degraded.status_code == 200
+    assert degraded.json()["top_directors"] == []
+
+    outage = False
+    epoch += 1
+    recovered = client.get(
+        "/api/users/alice/infographic", headers={"if-none-match": degraded.headers["etag"]}
+    )
+    assert recovered.status_code == 200
+    assert recovered.headers["etag"] != degraded.headers["etag"]
+    assert [x["name"] for x in recovered.json()["top_directors"]] == ["Ridley Scott"]
+
+
+def test_build_infographic_summary_only_fetches_uncached_films(
+    tmp_path: Path, monkeypatch
+) -> None:
+    data_dir = tmp_path / "data"
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien", "heat", "dune"], watchlist=[]),
+        data_dir=data_dir,
+    )
+    persist_film_metadata(_fake_meta("heat"), data_dir=data_dir)
+
+    fetched: list[str] = []
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        fetched.append(slug)
+        return _fake_meta(slug)
+
+    monkeypatch.setattr("letterboxd_recommender.core.infographic.get_film_metadata", meta)
+    summary = build_infographic_summary("alice", data_dir=data_dir)
+
+    assert sorted(fetched) == ["alien", "dune"]
+    assert [name for name, _ in summary.top_directors] == [
+        "Ridley Scott",
+        "Michael Mann",
+        "Denis Villeneuve",
+    ]
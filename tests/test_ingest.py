@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+import threading
 import zipfile
 from pathlib import Path
 
@@ -55,6 +56,31 @@ def test_ingest_user_falls_back_to_profile_rss_on_403() -> None:
     assert result.watchlist == []
 
 
+def test_ingest_user_fetches_watched_and_watchlist_feeds() -> None:
+    feeds = {
+        "/films/rss/": "https://letterboxd.com/film/alien/",
+        "/watchlist/rss/": "https://letterboxd.com/film/dune/",
+    }
+    requested: list[str] = []
+
+    class FakeClient:
+        def get(self, url: str):
+            requested.append(url)
+            for suffix, link in feeds.items():
+                if url.endswith(suffix):
+                    xml = f"<rss><channel><item><link>{link}</link></item></channel></rss>"
+                    return httpx.Response(200, text=xml, request=httpx.Request("GET", url))
+            return httpx.Response(500, request=httpx.Request("GET", url))
+
+    result = ingest_user("alice", client=FakeClient())  # type: ignore[arg-type]
+    assert result.watched == ["alien"]
+    assert result.watchlist == ["dune"]
+    assert sorted(requested) == [
+        "https://letterboxd.com/alice/films/rss/",
+        "https://letterboxd.com/alice/watchlist/rss/",
+    ]
+
+
 def test_import_export_endpoint_persists_lists(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
 
@@ -90,3 +116,66 @@ def test_import_export_endpoint_persists_lists(tmp_path: Path, monkeypatch) -> N
     user_dir = tmp_path / "data" / "users" / "alice"
     assert (user_dir / "watched.txt").read_text() == "alien\nheat\n"
     assert (user_dir / "watchlist.txt").read_text() == "dune\n"
+
+
+def test_ingest_runs_on_io_executor(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+
+    threads: list[str] = []
+
+    def fake_ingest(username: str) -> IngestedLists:
+        threads.append(threading.current_thread().name)
+        return IngestedLists(username=username, watched=["alien"], watchlist=[])
+
+    monkeypatch.setattr(routes, "ingest_user", fake_ingest)
+
+    resp = TestClient(create_app()).post("/api/users/alice/ingest")
+    assert resp.status_code == 200
+    assert threads and threads[0].startswith("io")
+
+
+def test_ingest_builds_user_dataframe_in_background(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+
+    calls: list[tuple[str, str]] = []
+
+    def fake_ingest(username: str) -> IngestedLists:
+        calls.append(("ingest", username))
+        return IngestedLists(username=username, watched=["alien"], watchlist=[])
+
+    def fake_build(username: str, **_kwargs):
+        calls.append(("build", threading.current_thread().name))
+
+    monkeypatch.setattr(routes, "ingest_user", fake_ingest)
+    monkeypatch.setattr(routes, "build_or_load_user_films_df", fake_build)
+
+    # TestClient runs background tasks once the response has been sent.
+    resp = TestClient(create_app()).post("/api/users/alice/ingest")
+    assert resp.status_code == 200
+    assert [c[0] for c in calls] == ["ingest", "build"]
+    assert calls[1][1].startswith("io")
+
+
+def test_import_export_rejects_oversized_upload(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_MAX_UPLOAD_MB", "0.001")  # ~1 KB
+
+    client = TestClient(create_app())
+    resp = client.post(
+        "/api/users/alice/import-export",
+        files={"file": ("diary.csv", b"x" * 4096, "text/csv")},
+    )
+    assert resp.status_code == 413
+
+    # Without a Content-Length the body is counted as it streams in.
+    def chunks():
+        for _ in range(8):
+            yield b"x" * 512
+
+    resp = client.post(
+        "/api/users/alice/import-export",
+        content=chunks(),
+        headers={"content-type": "multipart/form-data; boundary=abc"},
+    )
+    assert resp.status_code == 413
+    assert not (tmp_path / "data" / "users" / "alice").exists()
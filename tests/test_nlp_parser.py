@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from letterboxd_recommender.core.nlp import parse_refinement_prompt
+from letterboxd_recommender.core.nlp import _parse_include_countries, parse_refinement_prompt
 
 
 def test_parse_empty_prompt_is_refine_with_no_constraints() -> None:
@@ -43,3 +43,8 @@ def test_parse_between_years() -> None:
 def test_parse_country_when_explicit() -> None:
     result = parse_refinement_prompt("5 more from South Korea cinema")
     assert result.constraints.include_countries == ("south korea",)
+
+
+def test_parse_genre_prompt_does_not_yield_country() -> None:
+    assert _parse_include_countries("from action genre") == ()
+    assert parse_refinement_prompt("more from action genre").constraints.include_countries == ()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from fastapi.testclient import TestClient
 
+from letterboxd_recommender.api import rate_limit
 from letterboxd_recommender.api.app import create_app
 
 
@@ -18,3 +19,65 @@ def test_rate_limit_returns_429(monkeypatch) -> None:
     r3 = client.get("/health")
     assert r3.status_code == 429
     assert r3.json()["detail"] == "Rate limit exceeded"
+    assert r3.headers["content-type"] == "application/json"
+    assert r3.headers["content-length"] == str(len(r3.content))
+
+
+def test_rate_limiter_sweeps_expired_windows(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limit, "_SWEEP_EVERY", 1)
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+
+    limiter = rate_limit.SlidingWindowRateLimiter()
+    for i in range(200):
+        assert limiter.allow(key=f"10.0.0.{i}", limit=5, window_s=60)[0]
+
+    assert sum(len(w) for shard in limiter._windows for w in shard.values()) == 200
+
+    # Once every window has expired, checks for other clients drop the stale keys.
+    now[0] += 121
+    for i in range(2000):
+        limiter.allow(key=f"10.1.{i // 250}.{i % 250}", limit=5, window_s=60)
+
+    remaining = {k for shard in limiter._windows for w in shard.values() for k in w}
+    assert not any(k.startswith("10.0.0.") for k in remaining)
+
+
+def test_rate_limiter_buckets_are_independent() -> None:
+    limiter = rate_limit.SlidingWindowRateLimiter()
+
+    assert limiter.allow(key="10.0.0.1", limit=1, window_s=60)[0]
+    assert not limiter.allow(key="10.0.0.1", limit=1, window_s=60)[0]
+    assert limiter.allow(key="10.0.0.1", limit=1, window_s=60, bucket="ingest")[0]
+
+
+def test_rate_limiter_carries_over_previous_window(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = rate_limit.SlidingWindowRateLimiter()
+
+    assert limiter.allow(key="10.0.0.1", limit=2, window_s=60)[0]
+    assert limiter.allow(key="10.0.0.1", limit=2, window_s=60)[0]
+
+    # Just past the boundary a fixed window would allow two more; the weighted
+    # previous count leaves room for only one.
+    now[0] += 61
+    assert limiter.allow(key="10.0.0.1", limit=2, window_s=60)[0]
+    assert not limiter.allow(key="10.0.0.1", limit=2, window_s=60)[0]
+
+    # The carried-over weight decays as the current window progresses.
+    now[0] = 1115.0
+    assert limiter.allow(key="10.0.0.1", limit=2, window_s=60)[0]
+
+
+def test_allow_many_charges_all_buckets_or_none() -> None:
+    limiter = rate_limit.SlidingWindowRateLimiter()
+    checks = (("global", 3, 60.0), ("ingest", 1, 60.0))
+
+    assert limiter.allow_many(key="10.0.0.1", checks=checks) == (True, None)
+    assert limiter.allow_many(key="10.0.0.1", checks=checks) == (False, "ingest")
+
+    # The rejected ingest request did not consume a global hit.
+    assert limiter.allow(key="10.0.0.1", limit=3, window_s=60)[0]
+    assert limiter.allow(key="10.0.0.1", limit=3, window_s=60)[0]
+    assert not limiter.allow(key="10.0.0.1", limit=3, window_s=60)[0]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import threading
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -7,6 +9,7 @@ from fastapi.testclient import TestClient
 from letterboxd_recommender.api.app import create_app
 from letterboxd_recommender.core.film_metadata import FilmMetadata
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists, persist_ingest
+from letterboxd_recommender.core.recommender import cached_recommend_for_user
 
 
 def _fake_meta(slug: str) -> FilmMetadata:
@@ -61,3 +64,115 @@ def test_recommend_endpoint_returns_5_and_excludes_watched_and_watchlist(
     # must exclude watched + watchlist
     excluded = {"alien", "heat", "dune"}
     assert not (excluded & {r["film_id"] for r in recs})
+
+
+def test_json_endpoints_openapi_keep_response_schemas() -> None:
+    client = TestClient(create_app())
+
+    spec = client.get("/openapi.json").json()
+    expected = {
+        ("/api/recommend", "post"): "RecommendResponse",
+        ("/api/evaluate", "post"): "EvaluateResponse",
+        ("/api/users/{username}/ingest", "post"): "IngestResponse",
+        ("/api/users/{username}/import-export", "post"): "ImportExportResponse",
+        ("/api/users/{username}/infographic", "get"): "InfographicSummaryResponse",
+    }
+    for (path, method), schema in expected.items():
+        ok = spec["paths"][path][method]["responses"]["200"]
+        assert ok["content"]["application/json"]["schema"] == {
+            "$ref": f"#/components/schemas/{schema}"
+        }
+
+
+def test_recommend_runs_on_dedicated_executor(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_RECOMMEND_WORKERS", "2")
+
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.recommender.POPULAR_FILM_SLUGS", ["alien", "heat"]
+    )
+
+    threads: set[str] = set()
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        threads.add(threading.current_thread().name)
+        return _fake_meta(slug)
+
+    monkeypatch.setattr("letterboxd_recommender.core.recommender.get_film_metadata", meta)
+
+    app = create_app()
+    assert app.state.recommend_executor._max_workers == 2
+
+    resp = TestClient(app).post("/api/recommend", json={"username": "alice", "k": 1})
+    assert resp.status_code == 200
+    assert threads and all(name.startswith("recommend") for name in threads)
+
+
+def test_cached_recommendations_reuse_results_until_lists_change(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.recommender.POPULAR_FILM_SLUGS", ["heat", "whiplash"]
+    )
+
+    calls: list[str] = []
+
+    def meta(slug: str, **_) -> FilmMetadata:
+        calls.append(slug)
+        return _fake_meta(slug)
+
+    monkeypatch.setattr("letterboxd_recommender.core.recommender.get_film_metadata", meta)
+
+    first = cached_recommend_for_user("alice", k=1)
+    fetched = len(calls)
+    assert cached_recommend_for_user("alice", k=1) == first
+    assert len(calls) == fetched
+
+    # A different exclusion set is a different key.
+    cached_recommend_for_user("alice", k=1, exclude_slugs={first[0].film_id})
+    assert len(calls) > fetched
+
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien", "heat"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    assert [r.film_id for r in cached_recommend_for_user("alice", k=1)] == ["whiplash"]
+
+
+def test_recommend_stream_returns_ndjson_lines(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.recommender.POPULAR_FILM_SLUGS",
+        ["alien", "heat", "the-matrix", "parasite"],
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.recommender.get_film_metadata",
+        lambda slug, **_: _fake_meta(slug),
+    )
+
+    client = TestClient(create_app())
+    resp = client.post("/api/recommend/stream", json={"username": "alice", "k": 2})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    *recs, trailer = lines
+    assert len(recs) == 2
+    assert all(r["film_id"] != "alien" for r in recs)
+    assert trailer["username"] == "alice" and trailer["session_id"]
+
+    missing = client.post("/api/recommend/stream", json={"username": "nobody"})
+    assert missing.status_code == 404
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import zlib
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
+from letterboxd_recommender.api import routes
 from letterboxd_recommender.api.app import create_app
-from letterboxd_recommender.core.film_metadata import FilmMetadata
+from letterboxd_recommender.api.routes import _gzip_stream, _render_rec_cards, _render_rows
+from letterboxd_recommender.core.film_metadata import FilmMetadata, FilmMetadataError
 from letterboxd_recommender.core.letterboxd_ingest import IngestedLists, persist_ingest
+from letterboxd_recommender.core.recommender import RecommendationItem
 
 
 def _meta(slug: str) -> FilmMetadata:
@@ -79,6 +85,124 @@ def test_report_page_renders_infographic_and_recommendations(
     assert "Top genres" in body
     assert "Recommendations" in body
 
+    assert "recs: 2" in body
     # Should include our deterministic candidate titles.
     assert "Cand 1" in body
     assert "Cand 2" in body
+
+
+def test_render_rows_scales_widths_and_escapes_names() -> None:
+    html = _render_rows([("<Drama>", 4), ("Crime", 1)])
+    rows = html.split("\n")
+    assert len(rows) == 2
+    assert "&lt;Drama&gt;" in rows[0] and "width:100%" in rows[0]
+    assert "width:25%" in rows[1] and '<div class="bar-val">1</div>' in rows[1]
+
+
+def test_render_rows_top_row_is_full_width() -> None:
+    html = _render_rows([("Drama", 97), ("Crime", 50)])
+    rows = html.split("\n")
+    assert "width:100%" in rows[0]
+    assert "width:51%" in rows[1]
+
+
+def test_render_rec_cards_escapes_fields() -> None:
+    rec = RecommendationItem(
+        film_id="a&b",
+        title="<Alien>",
+        year=1979,
+        blurb='say "hi"',
+        why="",
+        score=0.5,
+        score_breakdown={},
+        overlaps={},
+    )
+
+    html = _render_rec_cards([rec])
+    assert "<h3>&lt;Alien&gt; <span class=\"year\">(1979)</span></h3>" in html
+    assert "<code>a&amp;b</code> · score 0.500" in html
+    assert "<p>say &quot;hi&quot;</p>" in html
+    assert "rec-why" not in html
+    assert "No recommendations" in _render_rec_cards([])
+
+
+def test_report_page_is_gzip_compressed(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr("letterboxd_recommender.core.recommender.POPULAR_FILM_SLUGS", ["heat"])
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.infographic.get_film_metadata",
+        lambda slug, **_: _meta(slug),
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.recommender.get_film_metadata",
+        lambda slug, **_: _meta(slug),
+    )
+
+    client = TestClient(create_app())
+    resp = client.get("/users/alice/report", headers={"accept-encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Report: alice" in resp.text
+
+
+def test_gzip_stream_flushes_each_chunk() -> None:
+    async def chunks():
+        yield b"<head>"
+        yield b"<body>"
+
+    async def collect() -> list[bytes]:
+        return [part async for part in _gzip_stream(chunks())]
+
+    parts = asyncio.run(collect())
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # The head is decodable on its own, before the rest of the page exists.
+    assert decoder.decompress(parts[0]) == b"<head>"
+    assert decoder.decompress(b"".join(parts[1:])) == b"<body>"
+    assert decoder.eof
+
+
+def test_report_page_404s_for_unknown_user_before_streaming(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+
+    resp = TestClient(create_app()).get("/users/nobody/report")
+    assert resp.status_code == 404
+
+
+def test_report_page_is_not_cached_and_only_reports_upstream_failures(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("LETTERBOXD_RECOMMENDER_DATA_DIR", str(tmp_path / "data"))
+    persist_ingest(
+        IngestedLists(username="alice", watched=["alien"], watchlist=[]),
+        data_dir=tmp_path / "data",
+    )
+    monkeypatch.setattr(
+        "letterboxd_recommender.core.infographic.get_film_metadata",
+        lambda slug, **_: _meta(slug),
+    )
+
+    def upstream_down(username: str, **_):
+        raise FilmMetadataError("Letterboxd responded with 503")
+
+    monkeypatch.setattr(routes, "cached_recommend_for_user", upstream_down)
+
+    client = TestClient(create_app())
+    resp = client.get("/users/alice/report")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-store"
+    assert "etag" not in resp.headers
+    assert "Report unavailable" in resp.text
+    assert "Letterboxd responded with 503" in resp.text
+
+    def broken(username: str, **_):
+        raise KeyError("bug")
+
+    monkeypatch.setattr(routes, "cached_recommend_for_user", broken)
+    with pytest.raises(KeyError):
+        client.get("/users/alice/report")
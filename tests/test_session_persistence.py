@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import importlib
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
 from letterboxd_recommender.core.film_metadata import FilmMetadata
@@ -70,3 +73,82 @@ def test_session_is_persisted_to_sqlite_across_app_instances(
 
     # Should not repeat, even across app instances.
     assert not (recs1 & recs2)
+
+
+def test_session_save_rejects_stale_state(tmp_path: Path) -> None:
+    from letterboxd_recommender.api.session import SessionConflictError, SessionStore
+
+    store = SessionStore(db_path=tmp_path / "sessions.sqlite3")
+    session_id, first = store.get_or_create(None)
+    _, second = store.get_or_create(session_id)
+
+    first.recommended_slugs.add("alien")
+    store.save(session_id, first)
+
+    second.recommended_slugs.add("heat")
+    with pytest.raises(SessionConflictError):
+        store.save(session_id, second)
+
+    _, fresh = store.get_or_create(session_id)
+    assert fresh.recommended_slugs == {"alien"}
+    fresh.recommended_slugs.add("heat")
+    store.save(session_id, fresh)
+    assert store.get_or_create(session_id)[1].recommended_slugs == {"alien", "heat"}
+
+
+def test_session_store_adds_version_column_to_existing_db(tmp_path: Path) -> None:
+    from letterboxd_recommender.api.session import SessionStore
+
+    db_path = tmp_path / "sessions.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE sessions (session_id TEXT PRIMARY KEY, "
+        "recommended_slugs_json TEXT NOT NULL, updated_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO sessions VALUES ('old', '[\"alien\"]', ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    store = SessionStore(db_path=db_path)
+    _, state = store.get_or_create("old")
+    assert state.recommended_slugs == {"alien"}
+    store.save("old", state)
+
+
+def test_session_store_evicts_periodically(tmp_path: Path, monkeypatch) -> None:
+    from letterboxd_recommender.api import session
+
+    monkeypatch.setattr(session, "_EVICT_EVERY", 4)
+    store = session.SessionStore(db_path=tmp_path / "sessions.sqlite3", max_sessions=2)
+
+    def count() -> int:
+        return store._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    for _ in range(3):
+        store.get_or_create(None)
+    assert count() == 3  # no eviction between sweeps
+
+    store.get_or_create(None)
+    assert count() == 2
+
+
+def test_session_cache_recovers_from_writes_by_another_process(tmp_path: Path) -> None:
+    from letterboxd_recommender.api.session import SessionConflictError, SessionStore
+
+    db_path = tmp_path / "sessions.sqlite3"
+    worker_a = SessionStore(db_path=db_path)
+    worker_b = SessionStore(db_path=db_path)
+
+    session_id, state_a = worker_a.get_or_create(None)  # now cached in worker_a
+    _, state_b = worker_b.get_or_create(session_id)
+    state_b.recommended_slugs.add("heat")
+    worker_b.save(session_id, state_b)
+
+    # worker_a's cached copy is stale: its save is rejected and the re-read is fresh.
+    _, stale = worker_a.get_or_create(session_id)
+    stale.recommended_slugs.add("alien")
+    with pytest.raises(SessionConflictError):
+        worker_a.save(session_id, stale)
+
+    _, fresh = worker_a.get_or_create(session_id)
+    assert fresh.recommended_slugs == {"heat"}
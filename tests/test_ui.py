@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 from fastapi.testclient import TestClient
 
 from letterboxd_recommender.api.app import create_app
@@ -20,3 +22,40 @@ def test_index_page_renders_minimal_ui() -> None:
     assert "id=\"import_btn\"" in body
     assert "id=\"prompt\"" in body
     assert "id=\"infographic\"" in body
+
+
+def test_index_page_is_served_precompressed_when_gzip_accepted() -> None:
+    client = TestClient(create_app())
+
+    gz = client.get("/", headers={"accept-encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "<title>Letterboxd Recommender</title>" in gz.text
+
+    raw = client.get("/", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert raw.text == gz.text
+
+
+def test_index_page_revalidates_with_etag() -> None:
+    client = TestClient(create_app())
+
+    first = client.get("/")
+    assert "max-age" in first.headers["cache-control"]
+
+    again = client.get("/", headers={"if-none-match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_page_css_is_served_as_versioned_static_asset() -> None:
+    client = TestClient(create_app())
+
+    body = client.get("/").text
+    match = re.search(r'href="(/static/app\.css\?v=[0-9a-f]+)"', body)
+    assert match is not None
+    assert "<style>" not in body
+
+    css = client.get(match.group(1))
+    assert css.status_code == 200
+    assert css.headers["content-type"].startswith("text/css")
+    assert "immutable" in css.headers["cache-control"]